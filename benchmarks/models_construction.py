@@ -0,0 +1,58 @@
+"""
+Benchmark of models construction: usual validation vs trusted construction vs lazy models.
+
+Run: python benchmarks/models_construction.py
+"""
+import sys
+import timeit
+
+sys.path.append(".")
+
+from vk.types import base  # noqa
+from vk.types.lazy import make_lazy  # noqa
+from vk.utils.get_event import get_event_object  # noqa
+from vk.types.events.community.event import MessageNew  # noqa
+
+NUMBER = 10000
+
+MESSAGE = {
+    "id": 1,
+    "date": 1567000000,
+    "peer_id": 2000000001,
+    "from_id": 1,
+    "text": "/start hello world",
+    "random_id": 0,
+    "important": False,
+    "attachments": [
+        {"type": "photo", "photo": {"id": 1, "owner_id": 1, "album_id": 1}},
+        {"type": "sticker", "sticker": {"product_id": 1, "sticker_id": 1}},
+    ],
+    "fwd_messages": [{"id": 2, "from_id": 2, "text": "forwarded", "date": 1}],
+    "reply_message": {"id": 3, "from_id": 3, "text": "reply", "date": 1},
+}
+EVENT = {"type": "message_new", "object": MESSAGE, "group_id": 1}
+
+
+def bench(name: str, func):
+    took = timeit.timeit(func, number=NUMBER)
+    print(f"{name:<40} {took / NUMBER * 1e6:8.2f} us per event")
+
+
+def main():
+    bench("validation (default)", lambda: get_event_object(EVENT))
+    bench(
+        "lazy, access only peer_id",
+        lambda: get_event_object(EVENT, lazy=True).object.peer_id,
+    )
+
+    base.set_trusted_construction(True)
+    try:
+        bench("trusted construction", lambda: get_event_object(EVENT))
+    finally:
+        base.set_trusted_construction(False)
+
+    assert MessageNew(**EVENT).dict() == make_lazy(MessageNew, EVENT).dict()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import sys
+
+sys.path.append("..")
+
+from types import SimpleNamespace
+
+from vk.bot_framework.rules.routing import TextRouter
+from vk.bot_framework.rules.rules import Regex
+
+
+def make_router(*patterns):
+    handlers = [SimpleNamespace(rules=[Regex(pattern)]) for pattern in patterns]
+    return TextRouter(handlers), handlers
+
+
+def test_same_group_names():
+    router, handlers = make_router(r"(?P<n>\d+)", r"buy (?P<n>\w+)")
+    assert router.get_candidates("buy milk") == [handlers[1]]
+    assert router.get_candidates("42") == [handlers[0]]
+    assert router.get_candidates("hello") == []
+
+
+def test_inline_flags():
+    router, handlers = make_router(r"(?i)abc", r"(?s)a.b", r"xyz")
+    assert router.get_candidates("ABC") == [handlers[0]]
+    assert router.get_candidates("a\nb") == [handlers[1]]
+    assert router.get_candidates("hello") == []
+
+
+def test_invalid_combination_falls_back():
+    # groups after escaped backslash aren't renamed, patterns are checked one by one
+    router, handlers = make_router(r"\\(?P<n>a)", r"\\(?P<n>b)")
+    assert router._combined_regex is None
+    assert router.get_candidates("\\b") == [handlers[1]]
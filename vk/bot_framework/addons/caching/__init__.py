@@ -1,2 +1,4 @@
 from .cached_object import CachedResponse
 from .core import cached_handler
+from .core import get_cache_name
+from .tiered import TieredCache
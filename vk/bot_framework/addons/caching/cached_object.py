@@ -8,5 +8,5 @@ class CachedResponse(BaseModel):
     Return this object for cache response.
     """
 
-    method_name: typing.AnyStr
+    method_name: str
     method_params: typing.Dict = {}
@@ -1,9 +1,10 @@
 import functools
+import typing
 
 from .cached_object import CachedResponse
-from vk.bot_framework import Dispatcher
+from .tiered import TieredCache
+from vk import VK
 from vk.bot_framework.dispatcher.storage import AbstractAsyncExpiredStorage
-from vk.constants import JSON_LIBRARY
 from vk.types.message import Message
 
 """
@@ -11,16 +12,37 @@ Now supporting only AbstractAsyncExpiredStorage-like storages.
 """
 
 
+def get_cache_name(handler_name: str, message: Message = None) -> str:
+    """
+    Get key of cached response (e.g. for TieredCache.invalidate).
+    :param handler_name: name of handler function
+    :param message: message of user, if response is cached for specify users
+    :return:
+    """
+    if message is not None:
+        return (
+            f"__coro_tocache:{handler_name}:user:{message.from_id}_{message.peer_id}__"
+        )
+    return f"__coro_tocache:{handler_name}__"
+
+
 def cached_handler(
-    storage: AbstractAsyncExpiredStorage, expire=10, for_specify_user=False
+    storage: typing.Union[AbstractAsyncExpiredStorage, TieredCache],
+    expire=10,
+    for_specify_user=False,
 ):
     """
     Standart caching time: 10 seconds
     :param for_specify_user: cache this response for specify users
-    :param storage: storage for cache
+    :param storage: storage for cache or TieredCache (with responses in process memory).
+        Concurrent calls of handler with the same key wait for the first call in both cases.
     :param expire: time in seconds for cache
     :return:
     """
+    if isinstance(storage, TieredCache):
+        cache = storage
+    else:
+        cache = TieredCache(storage, l1_size=0)
 
     def wrapper(func):
         @functools.wraps(func)
@@ -28,32 +50,32 @@ def cached_handler(
             message: Message = args[0]
             if not isinstance(message, Message):
                 raise RuntimeError("Now caching only message handlers is supported.")
-            if for_specify_user:
-                cache_name = f"__coro_tocache:{func.__name__}:user:{message.from_id}_{message.peer_id}__"
-            else:
-                cache_name = f"__coro_tocache:{func.__name__}__"
-            in_cache = await storage.exists(cache_name)
-            if in_cache:
-                cache = await storage.get(cache_name)
-                cache = JSON_LIBRARY.loads(cache)
-                params: dict = cache["method_params"]
-                params.update({"peer_id": message.peer_id, "from_id": message.from_id})
-                return await Dispatcher.get_current().vk.api_request(
-                    cache["method_name"], params
-                )
-            else:
+            cache_name = get_cache_name(
+                func.__name__, message if for_specify_user else None
+            )
+
+            result = None
+
+            async def fill():
+                nonlocal result
                 result = await func(*args, **kwargs)
                 if not isinstance(result, CachedResponse):
                     raise ValueError(
                         "Unexpected Response. Please return 'CachedResponse' for use this decorator"
                     )
-                try:
-                    await storage.place(
-                        cache_name, JSON_LIBRARY.dumps(result.dict()), expire=expire
-                    )
-                except RuntimeError:
-                    pass
-                return result
+                return result.dict()
+
+            cached = await cache.get_or_fill(cache_name, fill, expire)
+            if result is not None:
+                return result  # handler was called and answered itself
+            # cached value may be shared, so it isn't changed
+            params = {
+                **cached["method_params"],
+                "peer_id": message.peer_id,
+                "from_id": message.from_id,
+            }
+            # VK of the community of the event (look at Dispatcher.register_community)
+            return await VK.get_current().api_request(cached["method_name"], params)
 
         return wrapped
 
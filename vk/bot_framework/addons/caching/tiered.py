@@ -0,0 +1,204 @@
+"""
+Two-level cache: small in-process LRU (L1) with decoded values
+in front of shared storage (L2).
+"""
+import asyncio
+import logging
+import typing
+
+from vk.bot_framework.dispatcher.storage import AbstractAsyncExpiredStorage
+from vk.bot_framework.storages.redis import RedisStorage
+from vk.bot_framework.storages.ttldict import ExpiringDict
+from vk.constants import JSON_LIBRARY
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCacheStats(typing.NamedTuple):
+    l1_hits: int  # count of values got from process memory
+    l2_hits: int  # count of values got from storage
+    misses: int  # count of calls of 'fill'
+    coalesced: int  # count of reads which waited for other read or fill of the same key
+
+
+class TieredCache:
+    def __init__(
+        self,
+        storage: AbstractAsyncExpiredStorage,
+        l1_size: int = 256,
+        l1_ttl: int = 5,
+        invalidation_channel: str = None,
+    ):
+        """
+
+        >>> cache = TieredCache(redis_storage, invalidation_channel="cache-invalidation")
+        >>> @cached_handler(cache, expire=60)
+
+        :param storage: shared storage (L2), values are placed to it as JSON
+        :param l1_size: max count of values in process memory (0 - without L1)
+        :param l1_ttl: max time in seconds of keeping value in process memory.
+            Other nodes may change value in storage, so it's time of possible staleness
+            (if invalidation channel isn't used)
+        :param invalidation_channel: redis channel (only with RedisStorage) for removing
+            of invalidated keys from L1 of all nodes
+        """
+        if invalidation_channel is not None and not isinstance(storage, RedisStorage):
+            raise ValueError("Invalidation channel is supported only with RedisStorage")
+        self.storage: AbstractAsyncExpiredStorage = storage
+        self.l1_ttl: int = l1_ttl
+        self.invalidation_channel: typing.Optional[str] = invalidation_channel
+        self._l1: typing.Optional[ExpiringDict] = (
+            ExpiringDict(standart_ttl=l1_ttl, max_size=l1_size) if l1_size else None
+        )
+        # futures of keys which are read from storage or filled now
+        self._loading: typing.Dict[str, asyncio.Future] = {}
+        self._listener: typing.Optional[asyncio.Task] = None
+
+        self._l1_hits = 0
+        self._l2_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    @property
+    def stats(self) -> TieredCacheStats:
+        return TieredCacheStats(
+            l1_hits=self._l1_hits,
+            l2_hits=self._l2_hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+        )
+
+    def _place_l1(self, key: str, value: typing.Any, ttl: int):
+        if self._l1 is not None:
+            self._l1.set_with_ttl(key, value, max(1, min(ttl, self.l1_ttl)))
+
+    async def get(self, key: str) -> typing.Optional[typing.Any]:
+        """
+        Get value from L1 or storage.
+        :param key:
+        :return: decoded value or None
+        """
+        self._start_listener()
+        if self._l1 is not None:
+            value = self._l1.get(key)
+            if value is not None:
+                self._l1_hits += 1
+                return value
+        value = await self.storage.get(key)
+        if value is None:
+            return None
+        if isinstance(value, (str, bytes)):
+            value = JSON_LIBRARY.loads(value)
+        self._l2_hits += 1
+        self._place_l1(key, value, self.l1_ttl)
+        return value
+
+    async def place(self, key: str, value: typing.Any, expire: int):
+        """
+        Place value to storage and L1.
+        :param key:
+        :param value: JSON-serializable value
+        :param expire: time in seconds
+        :return:
+        """
+        try:
+            await self.storage.place(key, JSON_LIBRARY.dumps(value), expire=expire)
+        except RuntimeError:
+            pass  # other node placed it earlier
+        self._place_l1(key, value, expire)
+
+    async def get_or_fill(
+        self,
+        key: str,
+        fill: typing.Callable[[], typing.Awaitable[typing.Any]],
+        expire: int,
+    ) -> typing.Any:
+        """
+        Get value or call 'fill' and place its result. Concurrent calls with the same key
+        wait for one read of storage and one call of 'fill' (single-flight).
+        :param key:
+        :param fill: coroutine function which returns value for cache
+        :param expire: time in seconds
+        :return: value
+        """
+        self._start_listener()
+        while True:
+            if self._l1 is not None:
+                value = self._l1.get(key)
+                if value is not None:
+                    self._l1_hits += 1
+                    return value
+
+            loading = self._loading.get(key)
+            if loading is None:
+                break
+            self._coalesced += 1
+            value = await asyncio.shield(loading)
+            if value is not None:
+                return value
+            # fill of other call failed, try again
+
+        loading = asyncio.get_event_loop().create_future()
+        self._loading[key] = loading
+        value = None
+        try:
+            value = await self.get(key)
+            if value is None:
+                self._misses += 1
+                value = await fill()
+                await self.place(key, value, expire)
+            return value
+        finally:
+            del self._loading[key]
+            loading.set_result(value)
+
+    async def invalidate(self, key: str):
+        """
+        Remove value from storage and L1 (of all nodes, if invalidation channel is used).
+        :param key:
+        :return:
+        """
+        if self._l1 is not None:
+            self._l1.pop(key, None)
+        try:
+            await self.storage.delete(key)
+        except RuntimeError:
+            pass  # key doesn't exist
+        if self.invalidation_channel is not None:
+            conn = await self.storage.get_connection()
+            await conn.publish(self.invalidation_channel, key)
+
+    def _start_listener(self):
+        if (
+            self._listener is None
+            and self.invalidation_channel is not None
+            and self._l1 is not None
+        ):
+            self._listener = asyncio.get_event_loop().create_task(
+                self._listen_invalidations()
+            )
+
+    async def _listen_invalidations(self):
+        while True:
+            try:
+                conn = await self.storage.get_connection()
+                (channel,) = await conn.subscribe(self.invalidation_channel)
+                while await channel.wait_message():
+                    key = await channel.get(encoding="utf-8")
+                    self._l1.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa
+                logger.exception("Error while listening invalidations of cache:")
+            # L1 may miss invalidations while channel isn't subscribed
+            self._l1.clear()
+            await asyncio.sleep(1)
+
+    async def close(self):
+        """
+        Stop listening of invalidations.
+        :return:
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
@@ -2,7 +2,6 @@
 A simple cooldown util for message handlers.
 """
 import functools
-import time
 
 from vk.bot_framework.dispatcher.storage import AbstractAsyncExpiredStorage
 from vk.types.message import Message
@@ -15,10 +14,19 @@ class Cooldown(ContextInstanceMixin):
         storage: AbstractAsyncExpiredStorage,
         standart_cooldown_time: int = 3,
         for_specify_user: bool = False,
+        limit: int = 1,
     ):
+        """
+
+        :param storage:
+        :param standart_cooldown_time: standart cooldown time
+        :param for_specify_user: cooldown for specify user
+        :param limit: count of calls allowed during cooldown time
+        """
         self._storage = storage
         self._cooldown_time = standart_cooldown_time
         self._for_specify_user = for_specify_user
+        self._limit = limit
 
         self._cooldown_message: str = "Please, wait: {cooldown} seconds"
 
@@ -36,6 +44,7 @@ class Cooldown(ContextInstanceMixin):
         cooldown_time: int = None,
         for_specify_user: bool = None,
         cooldown_message: str = None,
+        limit: int = None,
     ):
         """
 
@@ -43,13 +52,14 @@ class Cooldown(ContextInstanceMixin):
         :param storage:
         :param cooldown_time: standart cooldown time: 3 seconds
         :param for_specify_user: cooldown for specify user
+        :param limit: count of calls allowed during cooldown time
         :return:
         """
 
         def wrapper(func):
             @functools.wraps(func)
             async def wrapped(*args, **kwargs):
-                nonlocal storage, cooldown_time, for_specify_user, cooldown_message
+                nonlocal storage, cooldown_time, for_specify_user, cooldown_message, limit
                 if storage is None:
                     storage = self._storage
                 if cooldown_time is None:
@@ -58,6 +68,8 @@ class Cooldown(ContextInstanceMixin):
                     for_specify_user = self._for_specify_user
                 if cooldown_message is None:
                     cooldown_message = self.cooldown_message
+                if limit is None:
+                    limit = self._limit
 
                 message: Message = args[0]
                 if not isinstance(message, Message):
@@ -66,23 +78,15 @@ class Cooldown(ContextInstanceMixin):
                     cooldown_name = f"__coro_tocooldown:{func.__name__}:user:{message.from_id}_{message.peer_id}__"
                 else:
                     cooldown_name = f"__coro_tocooldown:{func.__name__}__"
-                have_cooldown = await storage.exists(cooldown_name)
-                if have_cooldown:
-                    cd = round((await storage.get(cooldown_name)) - time.time(), 3)
+                # check and count call with one atomic operation of storage.
+                result = await storage.rate_limit(cooldown_name, limit, cooldown_time)
+                if not result.allowed:
+                    cd = round(result.retry_after, 3)
                     answer = cooldown_message.format(cooldown=cd)
                     await message.answer(answer)
 
                 else:
-                    result = await func(*args, **kwargs)
-                    try:
-                        await storage.place(
-                            cooldown_name,
-                            time.time() + cooldown_time,
-                            expire=cooldown_time,
-                        )
-                    except RuntimeError:
-                        pass
-                    return result
+                    return await func(*args, **kwargs)
 
             return wrapped
 
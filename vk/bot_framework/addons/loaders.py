@@ -0,0 +1,253 @@
+"""
+Batched loading of users and communities (like DataLoader).
+
+Ids requested within one iteration of event loop are sent as one 'users.get'
+or 'groups.getById' call, results are spread back to callers as models.
+
+>>> loader = UserLoader(vk)
+>>> user = await loader.load(message.from_id)  # concurrent loads are sent together
+
+With LoaderScopeMiddleware results are memoized while one event is processed.
+"""
+import asyncio
+import contextlib
+import contextvars
+import re
+import typing
+from abc import ABC
+from abc import abstractmethod
+
+from ..dispatcher.middleware import BaseMiddleware
+from vk import VK
+from vk.exceptions import APIException
+from vk.types import User
+from vk.types.community import Community
+
+# memo of loaded models (futures) in current scope
+_memo: contextvars.ContextVar[typing.Optional[dict]] = contextvars.ContextVar(
+    "loaders_memo", default=None
+)
+
+_USER_ID = re.compile(r"^id(\d+)$")
+_COMMUNITY_ID = re.compile(r"^(?:club|public|event|-)(\d+)$")
+
+
+@contextlib.contextmanager
+def loader_scope():
+    """
+    Memoize results of all loaders inside 'with' block
+    (tasks created inside it share memo too).
+    :return:
+    """
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+class BaseLoader(ABC):
+    method_name: str  # batched method
+    ids_param: str  # parameter of method with ids
+    max_batch_size: int  # max count of ids in one call
+
+    def __init__(
+        self,
+        vk: VK = None,
+        fields: typing.Iterable[str] = None,
+        max_batch_size: int = None,
+        delay: float = 0,
+    ):
+        """
+
+        :param vk: VK object, by default current
+        :param fields: additional fields of objects
+        :param max_batch_size: max count of ids in one call (by default limit of method)
+        :param delay: time in seconds to wait other ids (0 - only ids of current iteration
+            of event loop)
+        """
+        self.vk: VK = vk if vk is not None else VK.get_current()
+        self.fields: typing.Tuple[str, ...] = tuple(fields or ())
+        if max_batch_size is not None:
+            if not 0 < max_batch_size <= type(self).max_batch_size:
+                raise ValueError(
+                    f"Count of ids in one call must be from 1 to {type(self).max_batch_size}"
+                )
+            self.max_batch_size = max_batch_size
+        self.delay: float = delay
+
+        self._pending: typing.Dict[str, asyncio.Future] = {}
+        self._dispatch_handle: typing.Optional[asyncio.Handle] = None
+
+    @staticmethod
+    @abstractmethod
+    def normalize_id(id_: typing.Union[int, str]) -> str:
+        """
+        Get key of id or screen name which is equal to one of 'get_keys' of object.
+        :param id_:
+        :return:
+        """
+
+    def get_keys(self, item: dict) -> typing.Iterable[str]:
+        """
+        Get keys by which object can be requested.
+        :param item: object from response
+        :return:
+        """
+        keys = [str(item["id"])]
+        if item.get("screen_name"):
+            keys.append(item["screen_name"].lower())
+        return keys
+
+    @abstractmethod
+    def build(self, item: dict) -> typing.Any:
+        """
+        Build model of object.
+        :param item: object from response
+        :return:
+        """
+
+    def get_params(self, keys: typing.List[str]) -> dict:
+        return {
+            self.ids_param: ",".join(keys),
+            "fields": ",".join(self.fields) if self.fields else None,
+        }
+
+    async def load(self, id_: typing.Union[int, str]) -> typing.Optional[typing.Any]:
+        """
+        Load object by id or screen name.
+        :param id_:
+        :return: model or None, if object isn't found
+        """
+        key = self.normalize_id(id_)
+        memo = _memo.get()
+        memo_key = (self.method_name, self.fields, key)
+        if memo is not None and memo_key in memo:
+            return await asyncio.shield(memo[memo_key])
+
+        future = self._pending.get(key)
+        if future is None:
+            future = self.vk.loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._dispatch_handle is None:
+                if self.delay:
+                    self._dispatch_handle = self.vk.loop.call_later(
+                        self.delay, self._dispatch
+                    )
+                else:
+                    self._dispatch_handle = self.vk.loop.call_soon(self._dispatch)
+        if memo is not None:
+            memo[memo_key] = future
+        # cancellation of one caller doesn't cancel loading for others
+        return await asyncio.shield(future)
+
+    async def load_many(
+        self, ids: typing.Iterable[typing.Union[int, str]]
+    ) -> typing.List[typing.Optional[typing.Any]]:
+        """
+        Load objects by ids or screen names.
+        :param ids:
+        :return: models (or None) in order of ids
+        """
+        return list(await asyncio.gather(*(self.load(id_) for id_ in ids)))
+
+    def _dispatch(self):
+        """
+        Send collected ids in background.
+        :return:
+        """
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            self.vk.loop.create_task(self._load_batch(batch))
+
+    async def _load_batch(self, batch: typing.Dict[str, asyncio.Future]):
+        models = {}
+        try:
+            items = await self.vk.api_request(
+                self.method_name, self.get_params(list(batch))
+            )
+            # error handler of VK may return None instead of items
+            for item in items or ():
+                model = self.build(item)
+                for key in self.get_keys(item):
+                    models[key] = model
+        except APIException as exc:
+            if len(batch) == 1:
+                for future in batch.values():
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                # vk fails whole call if ids are invalid, halves of batch are loaded again
+                # one after another (so invalid id doesn't cause many requests at once).
+                keys = list(batch)
+                middle = len(keys) // 2
+                for half in (keys[:middle], keys[middle:]):
+                    await self._load_batch({key: batch[key] for key in half})
+        except Exception as exc:  # noqa
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            # callers never wait forever
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(models.get(key))
+
+
+class UserLoader(BaseLoader):
+    method_name = "users.get"
+    ids_param = "user_ids"
+    max_batch_size = 1000
+
+    @staticmethod
+    def normalize_id(id_: typing.Union[int, str]) -> str:
+        key = str(id_).strip().lower()
+        match = _USER_ID.match(key)
+        return match.group(1) if match else key
+
+    def get_params(self, keys: typing.List[str]) -> dict:
+        params = super().get_params(keys)
+        if not all(key.isdigit() for key in keys) and "screen_name" not in self.fields:
+            # screen names are matched with objects by this field
+            params["fields"] = ",".join(self.fields + ("screen_name",))
+        return params
+
+    def build(self, item: dict) -> User:
+        return User(**item)
+
+
+class CommunityLoader(BaseLoader):
+    method_name = "groups.getById"
+    ids_param = "group_ids"
+    max_batch_size = 500
+
+    @staticmethod
+    def normalize_id(id_: typing.Union[int, str]) -> str:
+        key = str(id_).strip().lower()
+        match = _COMMUNITY_ID.match(key)
+        return match.group(1) if match else key
+
+    def build(self, item: dict) -> Community:
+        return Community(**item)
+
+
+class LoaderScopeMiddleware(BaseMiddleware):
+    meta = {
+        "name": "LoaderScopeMiddleware",
+        "description": "Memoize results of loaders while one event is processed.",
+        "deprecated": False,
+    }
+
+    async def pre_process_event(self, event, data: dict) -> dict:
+        # workers process many events in one task, so memo is replaced for every event.
+        _memo.set({})
+        return data
+
+    async def post_process_event(self) -> None:
+        _memo.set(None)
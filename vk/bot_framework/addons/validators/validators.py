@@ -1,15 +1,18 @@
+from ..loaders import CommunityLoader
+from ..loaders import UserLoader
 from vk import VK
 from vk.exceptions import APIException
 from vk.types import Message
-from vk.types import User
-from vk.types.community import Community
 from vk.utils import ContextInstanceMixin
 
 
 class Validator(ContextInstanceMixin):
     def __init__(self, vk: VK = None):
         self._vk = vk if vk else VK.get_current()
-        self._api = vk.get_api()
+        self._api = self._vk.get_api()
+        # ids of concurrent validations are requested with one call
+        self.user_loader: UserLoader = UserLoader(self._vk)
+        self.community_loader: CommunityLoader = CommunityLoader(self._vk)
         self.validators_answers: dict = {
             "valid_vk_id": "",
             "positive_number": "",
@@ -36,16 +39,16 @@ class Validator(ContextInstanceMixin):
         """
         have_answer = self.validators_answers["valid_vk_group_id"]
         try:
-            result = await self.vk.api_request("groups.getById", {"group_id": arg})
+            result = await self.community_loader.load(arg)
         except APIException:
             if have_answer:
                 await message.answer(have_answer)
             return False
-        if not result and have_answer:
-            await message.answer(have_answer)
-        if result:
-            return {"valid_vk_group_id_group": Community(**result[0])}
-        return result
+        if result is None:
+            if have_answer:
+                await message.answer(have_answer)
+            return False
+        return {"valid_vk_group_id_group": result}
 
     async def valid_vk_id(self, arg: str, message: Message):
         """
@@ -66,16 +69,16 @@ class Validator(ContextInstanceMixin):
 
         have_answer = self.validators_answers["valid_vk_id"]
         try:
-            result = await self.vk.api_request("users.get", {"user_ids": arg})
+            result = await self.user_loader.load(arg)
         except APIException:
             if have_answer:
                 await message.answer(have_answer)
             return False
-        if not result and have_answer:
-            await message.answer(have_answer)
-        if result:
-            return {"valid_vk_id_user": User(**result[0])}
-        return result
+        if result is None:
+            if have_answer:
+                await message.answer(have_answer)
+            return False
+        return {"valid_vk_id_user": result}
 
     async def positive_number(self, arg: str, message: Message):
         """
@@ -9,3 +9,6 @@ from .handler import Handler
 from .storage import AbstractAsyncStorage
 from .storage import AbstractStorage
 from .storage import Storage
+from .workers import WorkerPool
+from .lanes import PeerLanes
+from vk.utils.overflow import OverflowPolicy
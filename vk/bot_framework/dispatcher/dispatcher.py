@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import typing
 
@@ -6,20 +7,29 @@ from .extension import BaseExtension
 from .extension import ExtensionsManager
 from .handler import BaseHandler
 from .handler import Handler
+from .lanes import get_peer_key
+from .lanes import PeerLanes
 from .middleware import BaseMiddleware
 from .middleware import MiddlewareManager
 from .rule import BaseRule
 from .rule import RuleFactory
 from .storage import AbstractAsyncStorage
 from .storage import AbstractStorage
+from .workers import WorkerPool
 from vk import VK
 from vk.bot_framework.dispatcher import data_
+from vk.bot_framework.rules.routing import TextRouter
 from vk.constants import default_extensions
 from vk.constants import default_rules
+from vk.longpoll import MultiBotLongPoll
+from vk.longpoll.user.longpoll import DEFAULT_MODE
+from vk.methods import API
 from vk.types import BotEvent as Event
 from vk.utils import ContextInstanceMixin
 from vk.utils import time_logging
 from vk.utils.get_event import get_event_object
+from vk.utils.get_event import get_event_type_value
+from vk.utils.overflow import OverflowPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +38,20 @@ class Dispatcher(ContextInstanceMixin):
 
     handler_class = Handler
 
-    def __init__(self, vk: VK, group_id: int):
+    def __init__(self, vk: VK, group_id: int, *, lazy_events: bool = False):
+        """
+
+        :param vk: VK object
+        :param group_id: id of community
+        :param lazy_events: build lazy event models: nested models (attachments,
+            forwarded messages, etc.) are validated only when handler or rule access them.
+        """
         self._vk: VK = vk
         self._group_id: int = group_id
+        self.lazy_events: bool = lazy_events
         self._handlers: typing.List[BaseHandler] = []
+        self._handlers_by_type: typing.Dict[str, typing.List[BaseHandler]] = {}
+        self._text_routers: typing.Dict[str, TextRouter] = {}
 
         self._middleware_manager: MiddlewareManager = MiddlewareManager(self)
         self._rule_factory: RuleFactory = RuleFactory(default_rules())
@@ -43,6 +63,11 @@ class Dispatcher(ContextInstanceMixin):
 
         self._registered_blueprints: typing.List[Blueprint] = []
 
+        self._worker_pool: typing.Optional[WorkerPool] = None
+        self._peer_lanes: typing.Optional[PeerLanes] = None
+
+        self._communities: typing.Dict[int, VK] = {}
+
         self.set_current(self)
 
     @property
@@ -87,6 +112,23 @@ class Dispatcher(ContextInstanceMixin):
         """
         return self._vk
 
+    def get_vk(self, group_id: int = None) -> VK:
+        """
+        Get VK instance of community.
+        :param group_id: id of community
+        :return: VK of registered community or default VK
+        """
+        return self._communities.get(group_id, self._vk)
+
+    def register_community(self, group_id: int, vk: VK):
+        """
+        Handle events of community with own VK instance (access token of community).
+        :param group_id: id of community
+        :param vk: VK object
+        :return:
+        """
+        self._communities[group_id] = vk
+
     @property
     def middlewares(self):
         """
@@ -95,6 +137,22 @@ class Dispatcher(ContextInstanceMixin):
         """
         return self._middleware_manager.middlewares
 
+    @property
+    def worker_pool(self) -> typing.Optional[WorkerPool]:
+        """
+        Returns a worker pool, if it setuped.
+        :return:
+        """
+        return self._worker_pool
+
+    @property
+    def peer_lanes(self) -> typing.Optional[PeerLanes]:
+        """
+        Returns a peer lanes, if they setuped.
+        :return:
+        """
+        return self._peer_lanes
+
     @property
     def storage(self):
         if not self._storage:
@@ -135,13 +193,38 @@ class Dispatcher(ContextInstanceMixin):
 
         return decorator
 
+    def get_handlers_by_type(
+        self, event_type: typing.Union[Event, str]
+    ) -> typing.List[BaseHandler]:
+        """
+        Returns a list of handlers registered for this event type (in order of registration).
+        :param event_type:
+        :return:
+        """
+        return self._handlers_by_type.get(get_event_type_value(event_type), [])
+
+    def _get_text_router(self, event_type: str) -> TextRouter:
+        """
+        Get (or build) index of text rules of handlers with this event type.
+        :param event_type:
+        :return:
+        """
+        router = self._text_routers.get(event_type)
+        if router is None:
+            router = TextRouter(self._handlers_by_type.get(event_type, []))
+            self._text_routers[event_type] = router
+        return router
+
     def _register_handler(self, handler: BaseHandler):
         """
-        Append handler to handlers list
+        Append handler to handlers list and to index of handlers by event type.
         :param handler:
         :return:
         """
+        event_type = get_event_type_value(handler.event_type)
         self._handlers.append(handler)
+        self._handlers_by_type.setdefault(event_type, []).append(handler)
+        self._text_routers.pop(event_type, None)  # rebuild index with new handler
         logger.debug(f"Handler '{handler.handler.__name__}' successfully added!")
 
     def register_message_handler(self, coro: typing.Callable, rules: typing.List):
@@ -241,6 +324,58 @@ class Dispatcher(ContextInstanceMixin):
         """
         self._extensions_manager.setup(extension)
 
+    def setup_worker_pool(
+        self,
+        workers: int = 10,
+        max_queue_size: int = 1000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.WAIT,
+    ):
+        """
+        Process events with fixed count of workers and bounded queue
+        instead of creating a task for every event.
+
+        >>> dp.setup_worker_pool(workers=20, max_queue_size=500, overflow_policy="drop_old")
+
+        :param workers: count of events processed at the same time
+        :param max_queue_size: max count of events which wait in queue
+        :param overflow_policy: what to do with coming event when queue is full.
+            With 'wait' (default) extension waits for free place in queue.
+        :return:
+        """
+        self._worker_pool = WorkerPool(
+            self._process_event,
+            self.vk.loop,
+            workers=workers,
+            max_queue_size=max_queue_size,
+            overflow_policy=overflow_policy,
+        )
+
+    def setup_peer_lanes(
+        self,
+        idle_timeout: float = 60,
+        max_lane_size: int = 0,
+        key: typing.Callable[[dict], typing.Any] = get_peer_key,
+    ):
+        """
+        Process events of one peer one by one (in order of coming),
+        events of different peers are processed in parallel.
+        Has priority over worker pool.
+
+        >>> dp.setup_peer_lanes(idle_timeout=30)
+
+        :param idle_timeout: time in seconds after which idle lane is closed
+        :param max_lane_size: max count of events which wait in one lane (0 - unlimited)
+        :param key: function which returns lane key of event. By default 'peer_id'/'from_id'.
+        :return:
+        """
+        self._peer_lanes = PeerLanes(
+            self._process_event,
+            self.vk.loop,
+            key=key,
+            idle_timeout=idle_timeout,
+            max_lane_size=max_lane_size,
+        )
+
     def middleware(self):
         """
         Add middleware to middlewares list with decorator.
@@ -279,12 +414,21 @@ class Dispatcher(ContextInstanceMixin):
         self._extensions_manager.run_extension(name, **extension_init_params)
 
     @time_logging(logger)
-    async def _process_event(self, event: dict):
+    async def _process_event(self, event: dict, raise_errors: bool = False):
         """
         Handle 1 event coming from extensions/vk.
         :param event: 1 event coming from extensions/vk
+        :param raise_errors: raise error of handler (after post-process middlewares)
+            instead of logging it. Extensions which redeliver failed events use it.
         :return:
         """
+        error: typing.Optional[Exception] = None
+        if self._communities:
+            # events of many communities, handlers must use VK of community of event.
+            vk = self.get_vk(event.get("group_id"))
+            VK.set_current(vk)
+            API.set_current(vk.get_api())
+
         data = {}  # dict for transfer data from middlewares to handlers and filters.
         # examples/bot_framework/simple_middleware.py
 
@@ -298,43 +442,186 @@ class Dispatcher(ContextInstanceMixin):
         logger.debug(f"Pre-process middlewares return this data: {data}")
         logger.debug(f"Pre-process middlewares result of skip_handler: {_skip_handler}")
 
+        handlers = self._handlers_by_type.get(event["type"])
+        # only handlers with type of this event are checked.
         if (
-            not _skip_handler
+            not _skip_handler and handlers
         ):  # if middlewares don`t skip this handler, dispatcher be check
             # rules and execute handlers.
-            ev = get_event_object(event)  # get event pydantic model.
-            for handler in self._handlers:  # check handlers
-                if (
-                    handler.event_type.value == ev.type
-                ):  # if hanlder type is equal event pydantic model.
-                    try:
-                        result = await handler.execute_handler(
-                            ev.object, data
-                        )  # if execute hanlder func
-                        # return non-False value, other handlers doesn`t be executed.
-                        if result:
-                            logger.debug(
-                                f"Event handler ({handler.handler.__name__}) successfully executed. Other "
-                                f"handlers doesn`t be executed..."
-                            )
-                            break
-                    except Exception:  # noqa
-                        logger.exception(
-                            f"Error in handler ({handler.handler.__name__}):"
+            # get event pydantic model.
+            ev = get_event_object(event, lazy=self.lazy_events)
+            router = self._get_text_router(event["type"])
+            if router.has_text_rules:
+                # skip handlers which text rules (commands, text, regex) can't be passed.
+                handlers = router.get_candidates(getattr(ev.object, "text", None))
+            for handler in handlers:  # check handlers
+                try:
+                    result = await handler.execute_handler(
+                        ev.object, data
+                    )  # if execute hanlder func
+                    # return non-False value, other handlers doesn`t be executed.
+                    if result:
+                        logger.debug(
+                            f"Event handler ({handler.handler.__name__}) successfully executed. Other "
+                            f"handlers doesn`t be executed..."
                         )
+                        break
+                except Exception as exc:  # noqa
+                    if raise_errors:
+                        error = exc
+                        break
+                    logger.exception(f"Error in handler ({handler.handler.__name__}):")
 
         await self._middleware_manager.trigger_post_process_middlewares()
         # trigger post_process_event funcs in middlewares.
+        if error is not None:
+            raise error
 
-    async def _process_events(self, events: typing.List[dict]):
+    async def _process_events(self, events: typing.List[dict]) -> asyncio.Future:
         """
         Process events coming from extensions.
+        Events are processed in background, returns when they are scheduled.
         :param events: list of events coming from extension/vk.
-        :return:
+        :return: future which is done when all events are processed
+            (e.g. for saving of polling checkpoint)
         """
+        processed: asyncio.Future = self.vk.loop.create_future()
+        remaining = len(events)
+
+        def on_done(*_):
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                processed.set_result(None)
+
+        if not events:
+            processed.set_result(None)
         for event in events:
             logger.debug(f"Start processing event with type '{event['type']}'")
-            self.vk.loop.create_task(self._process_event(event))
+            if self._peer_lanes is not None:
+                await self._peer_lanes.put(event, on_done)
+            elif self._worker_pool is not None:
+                await self._worker_pool.put(event, on_done)
+            else:
+                task = self.vk.loop.create_task(self._process_event(event))
+                task.add_done_callback(on_done)
+        return processed
+
+    def run_polling(
+        self, pipelined: bool = False, checkpoint=None, on_history_expired=None
+    ):
+        """
+        Run polling extension.
+        :param pipelined: send next request to polling server while events are processed
+        :param checkpoint: place for saving ts of processed events (vk.longpoll.checkpoint).
+            Polling resumes from it after restart.
+        :param on_history_expired: coroutine function (old_ts, new_ts) which is called
+            when events after saved ts are lost (look at BotLongPoll)
+        :return:
+        """
+        self.run_extension(
+            "polling",
+            group_id=self.group_id,
+            vk=self.vk,
+            pipelined=pipelined,
+            checkpoint=checkpoint,
+            on_history_expired=on_history_expired,
+        )
+
+    def run_user_polling(
+        self,
+        mode: int = DEFAULT_MODE,
+        pipelined: bool = False,
+        checkpoint=None,
+        on_history_expired=None,
+    ):
+        """
+        Run polling of user (access token of VK object must be token of user).
+        New messages come to message handlers, other events have types of UserEvent.
+        :param mode: sum of flags of additional data in updates (look at UserLongPoll)
+        :param pipelined: send next request to polling server while events are processed
+        :param checkpoint: place for saving ts of processed events (vk.longpoll.checkpoint).
+        :param on_history_expired: coroutine function (old_ts, new_ts) which is called
+            when events after saved ts are lost (look at BotLongPoll)
+        :return:
+        """
+        self.run_extension(
+            "user_polling",
+            vk=self.vk,
+            mode=mode,
+            pipelined=pipelined,
+            checkpoint=checkpoint,
+            on_history_expired=on_history_expired,
+        )
+
+    def run_multi_polling(
+        self,
+        communities: typing.Union[typing.Dict[int, str], MultiBotLongPoll],
+        connections_limit: int = 0,
+    ):
+        """
+        Run polling of many communities with one dispatcher.
+        :param communities: access tokens of communities by ids of communities
+            or configured MultiBotLongPoll
+        :param connections_limit: max count of connections of shared session (0 - unlimited)
+        :return:
+        """
+        if not isinstance(communities, MultiBotLongPoll):
+            communities = MultiBotLongPoll(
+                communities, loop=self.vk.loop, connections_limit=connections_limit
+            )
+        self.run_extension("multi_polling", longpoll=communities)
 
-    def run_polling(self):
-        self.run_extension("polling", group_id=self.group_id, vk=self.vk)
+    def run_callback_api(
+        self,
+        confirmation_code: str = None,
+        secret_key: str = None,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        path: str = "/",
+        max_queue_size: int = 1000,
+        communities: typing.Dict[
+            int, typing.Tuple[typing.Union[str, VK], str, typing.Optional[str]]
+        ] = None,
+    ):
+        """
+        Run Callback API server extension.
+        :param confirmation_code: string which server must return for confirm address
+            (community of dispatcher)
+        :param secret_key: secret key from settings of Callback API (community of dispatcher)
+        :param host: host of web server
+        :param port: port of web server
+        :param path: path where VK sends events
+        :param max_queue_size: max count of events which wait for processing
+        :param communities: other communities which send events to the same address:
+            (access token or VK object, confirmation code, secret key or None)
+            by ids of communities
+        :return:
+        """
+        confirmation_codes = {}
+        secret_keys = {}
+        vks = {}
+        if confirmation_code is not None:
+            confirmation_codes[self.group_id] = confirmation_code
+            vks[self.group_id] = self.vk
+            if secret_key is not None:
+                secret_keys[self.group_id] = secret_key
+        for group_id, (vk, code, key) in (communities or {}).items():
+            vks[group_id] = vk
+            confirmation_codes[group_id] = code
+            if key is not None:
+                secret_keys[group_id] = key
+        if not confirmation_codes:
+            raise ValueError("Confirmation code of at least one community is required")
+
+        self.run_extension(
+            "callback_api",
+            vk=self.vk,
+            confirmation_codes=confirmation_codes,
+            secret_keys=secret_keys,
+            host=host,
+            port=port,
+            path=path,
+            max_queue_size=max_queue_size,
+            communities=vks,
+        )
@@ -0,0 +1,119 @@
+"""
+Ordered processing of events from the same peer.
+
+By default events are processed in independent tasks, so two messages from one chat
+may be handled out of order. With peer lanes events of one peer are processed one by one
+(in order of coming), but events of different peers are still processed in parallel.
+
+.. code-block:: python3
+    dp.setup_peer_lanes(idle_timeout=60)
+
+"""
+import asyncio
+import logging
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+def get_peer_key(event: dict) -> typing.Optional[int]:
+    """
+    Get peer of event: 'peer_id', 'from_id' or 'user_id' of event object.
+    :param event: raw event
+    :return: None if event doesn't have peer
+    """
+    obj = event.get("object")
+    if not isinstance(obj, dict):
+        return None
+    if isinstance(obj.get("message"), dict):  # api versions >= 5.103
+        obj = obj["message"]
+    for field in ("peer_id", "from_id", "user_id"):
+        value = obj.get(field)
+        if value is not None:
+            return value
+    return None
+
+
+class PeerLanesStats(typing.NamedTuple):
+    lanes: int  # count of active lanes
+    queued: int  # count of events which wait in lanes
+    in_flight: int  # count of events which are processing now
+
+
+class PeerLanes:
+    def __init__(
+        self,
+        process: typing.Callable[[dict], typing.Awaitable],
+        loop: asyncio.AbstractEventLoop,
+        key: typing.Callable[[dict], typing.Any] = get_peer_key,
+        idle_timeout: float = 60,
+        max_lane_size: int = 0,
+    ):
+        """
+
+        :param process: coroutine function which process 1 event
+        :param loop: event loop where lanes are run
+        :param key: function which returns lane key of event (None - process without lane)
+        :param idle_timeout: time in seconds after which idle lane is closed
+        :param max_lane_size: max count of events which wait in one lane (0 - unlimited)
+        """
+        self._process = process
+        self._loop = loop
+        self._key = key
+        self.idle_timeout: float = idle_timeout
+        self.max_lane_size: int = max_lane_size
+
+        # items of lanes are (event, callback which is called when event is processed)
+        self._lanes: typing.Dict[typing.Any, asyncio.Queue] = {}
+        self._in_flight = 0
+
+    @property
+    def stats(self) -> PeerLanesStats:
+        return PeerLanesStats(
+            lanes=len(self._lanes),
+            queued=sum(lane.qsize() for lane in self._lanes.values()),
+            in_flight=self._in_flight,
+        )
+
+    async def put(self, event: dict, on_done: typing.Callable[[], None] = None):
+        """
+        Put event to lane of its peer. Waits if lane is full.
+        :param event:
+        :param on_done: function which is called when event is processed
+        :return:
+        """
+        key = self._key(event)
+        if key is None:
+            self._loop.create_task(self._process_one(event, on_done))
+            return
+
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = asyncio.Queue(self.max_lane_size)
+            self._loop.create_task(self._lane_worker(key, lane))
+        await lane.put((event, on_done))
+
+    async def _process_one(
+        self, event: dict, on_done: typing.Callable[[], None] = None
+    ):
+        self._in_flight += 1
+        try:
+            await self._process(event)
+        except Exception:  # noqa
+            logger.exception("Error while processing event in lane:")
+        finally:
+            self._in_flight -= 1
+            if on_done is not None:
+                on_done()
+
+    async def _lane_worker(self, key, lane: asyncio.Queue):
+        while True:
+            try:
+                event, on_done = await asyncio.wait_for(lane.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if lane.empty():
+                    del self._lanes[key]
+                    logger.debug(f"Lane of peer {key} closed as idle")
+                    return
+                continue
+            await self._process_one(event, on_done)
@@ -1,11 +1,38 @@
 """
 A simple util for dispatcher for storage your data. e.g: database connection, messages count.
 """
+import math
+import time
 import typing
 from abc import ABC
 from abc import abstractmethod
 
 
+class RateLimitResult(typing.NamedTuple):
+    allowed: bool
+    retry_after: float  # time in seconds after which call will be allowed (if not allowed)
+
+
+def gcra(
+    tat: typing.Optional[float], now: float, limit: int, period: float
+) -> typing.Tuple[RateLimitResult, float]:
+    """
+    Generic cell rate algorithm: 'limit' calls per 'period' (calls may come in burst).
+    Only one value is kept for key - theoretical arrival time (tat).
+    :param tat: saved tat of key (None if key doesn't exist)
+    :param now: current time
+    :param limit: count of calls
+    :param period: period in seconds
+    :return: result and new tat which must be saved, if call is allowed
+    """
+    interval = period / limit
+    new_tat = max(tat if tat is not None else now, now) + interval
+    allow_at = new_tat - period
+    if now < allow_at:
+        return RateLimitResult(False, allow_at - now), new_tat
+    return RateLimitResult(True, 0.0), new_tat
+
+
 class AbstractStorage(ABC):
     @abstractmethod
     def place(self, key: typing.AnyStr, value: typing.Any) -> None:
@@ -99,6 +126,38 @@ class AbstractAsyncStorage(ABC):
         :return:
         """
 
+    async def get_many(
+        self, keys: typing.Iterable[typing.AnyStr], default: typing.Any = None
+    ) -> typing.List[typing.Any]:
+        """
+        Get values by keys from storage. Storages may override it with one request.
+        :param keys:
+        :param default: value for keys which don't exist
+        :return: values in order of keys
+        """
+        return [await self.get(key, default) for key in keys]
+
+    async def place_many(
+        self, values: typing.Dict[typing.AnyStr, typing.Any], **kwargs
+    ):
+        """
+        Place values to storage. Storages may override it with one request.
+        :param values: values by keys
+        :param kwargs: other params of 'place' (e.g. expire)
+        :return:
+        """
+        for key, value in values.items():
+            await self.place(key, value, **kwargs)
+
+    async def delete_many(self, keys: typing.Iterable[typing.AnyStr]) -> None:
+        """
+        Delete values by keys from storage. Storages may override it with one request.
+        :param keys:
+        :return:
+        """
+        for key in keys:
+            await self.delete(key)
+
 
 class AbstractExpiredStorage(AbstractStorage):
     @abstractmethod
@@ -113,6 +172,29 @@ class AbstractAsyncExpiredStorage(AbstractAsyncStorage):
     ) -> None:  # noqa
         pass
 
+    async def rate_limit(
+        self, key: typing.AnyStr, limit: int, period: float
+    ) -> RateLimitResult:
+        """
+        Check and count call: allowed 'limit' calls per 'period' seconds.
+        Storages override it with atomic operation,
+        this implementation isn't atomic (concurrent calls may pass together).
+        :param key:
+        :param limit: count of calls
+        :param period: period in seconds
+        :return:
+        """
+        now = time.time()
+        tat = await self.get(key)
+        result, new_tat = gcra(
+            float(tat) if tat is not None else None, now, limit, period
+        )
+        if result.allowed:
+            if tat is not None:
+                await self.delete(key)
+            await self.place(key, new_tat, expire=math.ceil(new_tat - now))
+        return result
+
 
 class Storage(AbstractStorage):
     """
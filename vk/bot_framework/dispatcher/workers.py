@@ -0,0 +1,133 @@
+"""
+Bounded processing of events with fixed count of workers.
+
+By default dispatcher creates a task for every coming event. With worker pool events wait in
+bounded queue, and when queue is full extension (e.g. polling) waits too - so handlers can't
+starve event loop and memory don't grows on spikes.
+
+.. code-block:: python3
+    dp.setup_worker_pool(workers=20, max_queue_size=500)
+
+"""
+import asyncio
+import logging
+import typing
+
+from vk.utils.overflow import OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolStats(typing.NamedTuple):
+    queue_size: int  # count of events which wait in queue
+    in_flight: int  # count of events which are processing now
+    processed: int  # count of processed events
+    dropped: int  # count of events dropped by overflow policy
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        process: typing.Callable[[dict], typing.Awaitable],
+        loop: asyncio.AbstractEventLoop,
+        workers: int = 10,
+        max_queue_size: int = 1000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.WAIT,
+    ):
+        """
+
+        :param process: coroutine function which process 1 event
+        :param loop: event loop where workers are run
+        :param workers: count of events processed at the same time
+        :param max_queue_size: max count of events which wait in queue
+        :param overflow_policy: what to do with coming event when queue is full
+        """
+        if workers < 1:
+            raise ValueError("Count of workers must be positive")
+        self._process = process
+        self._loop = loop
+        self.workers_count: int = workers
+        self.max_queue_size: int = max_queue_size
+        self.overflow_policy: OverflowPolicy = OverflowPolicy(overflow_policy)
+
+        # items of queue are (event, callback which is called when event is processed)
+        self._queue: typing.Optional[asyncio.Queue] = None
+        self._workers: typing.List[asyncio.Task] = []
+
+        self._in_flight = 0
+        self._processed = 0
+        self._dropped = 0
+
+    @property
+    def stats(self) -> WorkerPoolStats:
+        return WorkerPoolStats(
+            queue_size=self._queue.qsize() if self._queue is not None else 0,
+            in_flight=self._in_flight,
+            processed=self._processed,
+            dropped=self._dropped,
+        )
+
+    def start(self):
+        """
+        Create queue and run workers. Called automatically with first event.
+        :return:
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(self.max_queue_size)
+        self._workers = [
+            self._loop.create_task(self._worker()) for _ in range(self.workers_count)
+        ]
+        logger.debug(f"Worker pool started with {self.workers_count} workers")
+
+    async def close(self):
+        """
+        Cancel workers. Events in queue are lost.
+        :return:
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def put(self, event: dict, on_done: typing.Callable[[], None] = None):
+        """
+        Put event to queue. With 'wait' policy waits when queue is full.
+        :param event:
+        :param on_done: function which is called when event is processed or dropped
+        :return:
+        """
+        if self._queue is None:
+            self.start()
+
+        if not self._queue.full() or self.overflow_policy is OverflowPolicy.WAIT:
+            await self._queue.put((event, on_done))
+            return
+
+        self._dropped += 1
+        if self.overflow_policy is OverflowPolicy.DROP_NEW:
+            logger.warning("Events queue is full. Coming event dropped.")
+            if on_done is not None:
+                on_done()
+            return
+
+        _, dropped_on_done = self._queue.get_nowait()
+        logger.warning("Events queue is full. The oldest event dropped.")
+        if dropped_on_done is not None:
+            dropped_on_done()
+        self._queue.put_nowait((event, on_done))
+
+    async def _worker(self):
+        while True:
+            event, on_done = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._process(event)
+            except Exception:  # noqa
+                logger.exception("Error while processing event in worker:")
+            finally:
+                self._in_flight -= 1
+                self._processed += 1
+                if on_done is not None:
+                    on_done()
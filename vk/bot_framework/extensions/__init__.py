@@ -1,3 +1,6 @@
+from .callback import CallbackAPI
 from .kafka import Kafka
+from .multi_polling import MultiPolling
 from .polling import Polling
 from .rabbitmq import RabbitMQ
+from .user_polling import UserPolling
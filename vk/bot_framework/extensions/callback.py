@@ -0,0 +1,151 @@
+import asyncio
+import hmac
+import logging
+import typing
+
+from aiohttp import web
+
+from ..dispatcher.extension import BaseExtension
+from vk import VK
+from vk.constants import JSON_LIBRARY
+from vk.methods import API
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackAPI(BaseExtension):
+    """
+    Receive events with Callback API. Web server responds to VK right after
+    event is put to queue, events are processed from queue by dispatcher.
+
+    >>> dp.run_callback_api(confirmation_code="abcdef", secret_key="secret", port=8080)
+
+    Events of several communities may come to one address, handlers of community
+    events use VK object with access token of community.
+    """
+
+    key = "callback_api"
+
+    def __init__(
+        self,
+        vk,
+        confirmation_codes: typing.Dict[int, str],
+        secret_keys: typing.Dict[int, str] = None,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        path: str = "/",
+        max_queue_size: int = 1000,
+        max_batch_size: int = 100,
+        communities: typing.Dict[int, typing.Union[str, VK]] = None,
+    ):
+        """
+
+        :param vk: VK object of community (if events of one community are received)
+        :param confirmation_codes: confirmation codes of communities by ids of communities
+            (events of other communities are rejected)
+        :param secret_keys: secret keys of communities by ids of communities
+        :param communities: access tokens or VK objects of communities by ids of communities.
+            Required for every community, if events of several communities are received.
+        :param host: host of web server
+        :param port: port of web server
+        :param path: path where VK sends events
+        :param max_queue_size: max count of events which wait for processing.
+            When queue is full VK gets error and sends event again later.
+        :param max_batch_size: max count of events passed to dispatcher at once
+        """
+        communities = communities or {}
+        if len(confirmation_codes) > 1 and set(confirmation_codes) - set(communities):
+            raise ValueError(
+                "Access token or VK object of every community is required "
+                "for receiving events of several communities"
+            )
+        self._vk = vk
+        # VK objects of communities, other communities use 'vk'
+        self.communities: typing.Dict[int, VK] = {}
+        for group_id, value in communities.items():
+            if not isinstance(value, VK):
+                value = VK(value, loop=vk.loop, client=vk.client)
+                # new VK instance sets itself as current, restore previous one.
+                VK.set_current(vk)
+                API.set_current(vk.get_api())
+            self.communities[group_id] = value
+        self.confirmation_codes: typing.Dict[int, str] = confirmation_codes
+        self.secret_keys: typing.Dict[int, str] = secret_keys or {}
+        self.host: str = host
+        self.port: int = port
+        self.path: str = path
+        self.max_batch_size: int = max_batch_size
+
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue_size)
+
+    def get_app(self, app: web.Application = None) -> web.Application:
+        """
+        Add route of Callback API to application.
+        :param app: existing application. By default new application is created.
+        :return:
+        """
+        if app is None:
+            app = web.Application()
+        app.router.add_post(self.path, self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """
+        Handle request from VK.
+        :param request:
+        :return:
+        """
+        try:
+            event = JSON_LIBRARY.loads(await request.read())
+            group_id = event["group_id"]
+            event_type = event["type"]
+        except (ValueError, TypeError, KeyError):
+            return web.Response(status=400, text="bad request")
+        if not isinstance(group_id, int) or isinstance(group_id, bool):
+            return web.Response(status=400, text="bad request")
+
+        if group_id not in self.confirmation_codes:
+            logger.warning(f"Event of unknown community {group_id} rejected")
+            return web.Response(status=403, text="unknown community")
+
+        secret_key = self.secret_keys.get(group_id)
+        if secret_key is not None and not hmac.compare_digest(
+            str(event.get("secret", "")).encode(), secret_key.encode()
+        ):
+            logger.warning(
+                f"Event with wrong secret key of community {group_id} rejected"
+            )
+            return web.Response(status=403, text="wrong secret key")
+
+        if event_type == "confirmation":
+            return web.Response(text=self.confirmation_codes[group_id])
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Events queue is full. VK will send event again.")
+            return web.Response(status=503, text="busy")
+        return web.Response(text="ok")
+
+    async def get_events(self) -> typing.List:
+        events = [await self._queue.get()]
+        while len(events) < self.max_batch_size and not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+
+    async def run(self, dp):
+        for group_id, vk in self.communities.items():
+            dp.register_community(group_id, vk)
+
+        runner = web.AppRunner(self.get_app())
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        await site.start()
+        logger.info(
+            f"Callback API server started on {self.host}:{self.port}{self.path}"
+        )
+        try:
+            while True:
+                await dp._process_events(await self.get_events())
+        finally:
+            await runner.cleanup()
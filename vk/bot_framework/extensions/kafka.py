@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import typing
 
@@ -12,6 +13,15 @@ except ImportError:
 
 
 class Kafka(BaseExtension):
+    """
+    Consume events from Kafka in batches.
+
+    Partitions of batch are processed concurrently, events of one partition are processed
+    one by one (in order of offsets). Offsets are committed only after events are processed,
+    so events are delivered at least once. When handler fails, partition is read again from
+    failed message; after several retries message is skipped.
+    """
+
     key = "kafka"
 
     def __init__(
@@ -19,34 +29,129 @@ class Kafka(BaseExtension):
         vk,
         *topics: typing.Tuple[str],
         group_id: str,
-        bootstrap_servers: str = "localhost"
+        bootstrap_servers: str = "localhost",
+        max_batch_size: int = 500,
+        batch_timeout: float = 1,
+        max_retries: int = 3,
     ):
+        """
+
+        :param vk:
+        :param topics: topics with events (message may contain one event or list of events)
+        :param group_id: name of consumer group
+        :param bootstrap_servers:
+        :param max_batch_size: max count of messages in one batch
+        :param batch_timeout: max time in seconds of waiting for messages
+        :param max_retries: max count of repeated processing of failed message
+        """
         if aiokafka:
             self._vk = vk
+            self.max_batch_size: int = max_batch_size
+            self.batch_timeout: float = batch_timeout
+            self.max_retries: int = max_retries
+            # offset of failed message and count of its retries by partitions
+            self._retries: typing.Dict[typing.Any, typing.Tuple[int, int]] = {}
             self.consumer = aiokafka.AIOKafkaConsumer(
                 *topics,
                 loop=vk.loop,
                 bootstrap_servers=bootstrap_servers,
-                group_id=group_id
+                group_id=group_id,
+                enable_auto_commit=False,
             )
         else:
             raise RuntimeWarning(
                 "Please install aiokafka (pip install aiokafka) for use this extension"
             )
 
-    async def get_events(self) -> None:
-        pass
+    @staticmethod
+    def _decode_message(msg) -> typing.List[dict]:
+        if msg.value is None:
+            return []  # tombstone
+        try:
+            data = JSON_LIBRARY.loads(msg.value)
+        except (ValueError, TypeError):
+            # message never can be processed, it isn't read again.
+            logger.exception(f"Message with offset {msg.offset} skipped:")
+            return []
+        return data if isinstance(data, list) else [data]
+
+    def _decode(self, messages: typing.List) -> typing.List[dict]:
+        return [event for msg in messages for event in self._decode_message(msg)]
+
+    async def _get_batch(self) -> typing.Dict[typing.Any, typing.List]:
+        """
+        Get messages of partitions.
+        :return: lists of messages by partitions
+        """
+        return await self.consumer.getmany(
+            timeout_ms=int(self.batch_timeout * 1000), max_records=self.max_batch_size
+        )
+
+    async def get_events(self) -> typing.List:
+        batch = await self._get_batch()
+        return [
+            event for messages in batch.values() for event in self._decode(messages)
+        ]
+
+    async def _process_partition(self, dp, tp, messages: typing.List) -> int:
+        """
+        Process messages of partition one by one.
+        :param dp: dispatcher
+        :param tp: partition
+        :param messages:
+        :return: offset for commit (next after processed messages)
+        """
+        for msg in messages:
+            try:
+                for event in self._decode_message(msg):
+                    await dp._process_event(event, raise_errors=True)
+            except Exception:  # noqa
+                failed_offset, retries = self._retries.get(tp, (msg.offset, 0))
+                retries = retries + 1 if failed_offset == msg.offset else 1
+                if retries > self.max_retries:
+                    logger.exception(
+                        f"Message with offset {msg.offset} of {tp} skipped "
+                        f"after {self.max_retries} retries:"
+                    )
+                    self._retries.pop(tp, None)
+                    continue
+                logger.exception(
+                    f"Error while processing message with offset {msg.offset} of {tp}, "
+                    f"it will be read again:"
+                )
+                self._retries[tp] = (msg.offset, retries)
+                self.consumer.seek(tp, msg.offset)
+                return msg.offset
+            self._retries.pop(tp, None)
+        return messages[-1].offset + 1
+
+    async def _process_batch(self, dp, batch: typing.Dict[typing.Any, typing.List]):
+        """
+        Process partitions concurrently and commit offsets of processed messages.
+        :param dp: dispatcher
+        :param batch: lists of messages by partitions
+        :return:
+        """
+        partitions = list(batch)
+        offsets = await asyncio.gather(
+            *(self._process_partition(dp, tp, batch[tp]) for tp in partitions)
+        )
+        offsets = {
+            tp: offset
+            for tp, offset in zip(partitions, offsets)
+            if offset > batch[tp][0].offset
+        }
+        if offsets:
+            await self.consumer.commit(offsets)
 
     async def run(self, dp):
         await self.consumer.start()
+        logger.info("Kafka consumer started!")
         try:
-            # Consume messages
-            async for msg in self.consumer:
-                events = JSON_LIBRARY.loads(msg.value.decode())
-                if isinstance(events, list):
-                    dp._process_events(events)
-                else:
-                    dp._process_events([events])
+            while True:
+                batch = await self._get_batch()
+                if batch:
+                    await self._process_batch(dp, batch)
         finally:
-            # Will leave consumer group; perform autocommit if enabled.
+            # Will leave consumer group.
             await self.consumer.stop()
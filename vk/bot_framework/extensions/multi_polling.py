@@ -0,0 +1,35 @@
+from ..dispatcher.extension import BaseExtension
+from vk.longpoll import MultiBotLongPoll
+
+import typing
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MultiPolling(BaseExtension):
+    key = "multi_polling"
+
+    def __init__(self, longpoll: MultiBotLongPoll):
+        """
+
+        :param longpoll: multiplexer of polling of communities
+        """
+        self._longpoll: MultiBotLongPoll = longpoll
+        self._events: typing.Optional[typing.AsyncIterator] = None
+
+    async def get_events(self) -> typing.List:
+        if self._events is None:
+            self._events = self._longpoll.run(save_checkpoints=False).__aiter__()
+        return await self._events.__anext__()
+
+    async def run(self, dp):
+        while True:
+            events = await self.get_events()
+            group_id = events[0]["group_id"]
+            # handlers of community events use VK instance with access token of community.
+            dp.register_community(group_id, self._longpoll.get_vk(group_id))
+            processed = await dp._process_events(events)
+            # ts is saved when handlers of events are finished.
+            longpoll = self._longpoll.get_longpoll(group_id)
+            longpoll.save_checkpoint_after(processed, longpoll.yielded_ts)
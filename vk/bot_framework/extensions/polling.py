@@ -1,5 +1,6 @@
 from ..dispatcher.extension import BaseExtension
 from vk.longpoll import BotLongPoll
+from vk.longpoll.checkpoint import AbstractCheckpoint
 
 import typing
 import logging
@@ -10,8 +11,30 @@ logger = logging.getLogger(__name__)
 class Polling(BaseExtension):
     key = "polling"
 
-    def __init__(self, group_id: int, vk):
-        self._longpoll: BotLongPoll = BotLongPoll(group_id, vk)
+    def __init__(
+        self,
+        group_id: int,
+        vk,
+        pipelined: bool = False,
+        queue_size: int = 10,
+        checkpoint: AbstractCheckpoint = None,
+        on_history_expired: typing.Callable[[str, str], typing.Awaitable] = None,
+    ):
+        """
+
+        :param group_id:
+        :param vk:
+        :param pipelined: send next request to polling server while events are processed
+        :param queue_size: max count of lists of events which wait for processing (pipelined mode)
+        :param checkpoint: place for saving ts of processed events. Polling resumes from it.
+        :param on_history_expired: coroutine function (old_ts, new_ts) which is called
+            when events after saved ts are lost (look at BotLongPoll)
+        """
+        self._longpoll: BotLongPoll = BotLongPoll(
+            group_id, vk, checkpoint=checkpoint, on_history_expired=on_history_expired
+        )
+        self._pipelined = pipelined
+        self._queue_size = queue_size
 
     async def get_events(self) -> typing.List:
         return await self._longpoll.listen()
@@ -21,5 +44,18 @@ class Polling(BaseExtension):
 
         logger.info("Polling started!")
 
-        while True:
-            await dp._process_events(await self.get_events())
+        if self._pipelined:
+            async for events in self._longpoll.listen_pipelined(
+                self._queue_size, save_checkpoints=False
+            ):
+                processed = await dp._process_events(events)
+                # ts is saved when handlers of events are finished.
+                self._longpoll.save_checkpoint_after(
+                    processed, self._longpoll.yielded_ts
+                )
+        else:
+            while True:
+                events = await self.get_events()
+                processed = await dp._process_events(events)
+                if events:
+                    self._longpoll.save_checkpoint_after(processed)
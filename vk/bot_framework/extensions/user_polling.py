@@ -0,0 +1,39 @@
+from .polling import Polling
+from vk.longpoll import UserLongPoll
+from vk.longpoll.checkpoint import AbstractCheckpoint
+from vk.longpoll.user.longpoll import DEFAULT_MODE
+
+import typing
+
+
+class UserPolling(Polling):
+    """
+    Polling of user. Events are received and processed like in Polling.
+    """
+
+    key = "user_polling"
+
+    def __init__(
+        self,
+        vk,
+        mode: int = DEFAULT_MODE,
+        pipelined: bool = False,
+        queue_size: int = 10,
+        checkpoint: AbstractCheckpoint = None,
+        on_history_expired: typing.Callable[[str, str], typing.Awaitable] = None,
+    ):
+        """
+
+        :param vk: VK object with access token of user
+        :param mode: sum of flags of additional data in updates (look at UserLongPoll)
+        :param pipelined: send next request to polling server while events are processed
+        :param queue_size: max count of lists of events which wait for processing (pipelined mode)
+        :param checkpoint: place for saving ts of processed events. Polling resumes from it.
+        :param on_history_expired: coroutine function (old_ts, new_ts) which is called
+            when events after saved ts are lost (look at BotLongPoll)
+        """
+        self._longpoll: UserLongPoll = UserLongPoll(
+            vk, mode=mode, checkpoint=checkpoint, on_history_expired=on_history_expired
+        )
+        self._pipelined = pipelined
+        self._queue_size = queue_size
@@ -0,0 +1,134 @@
+"""
+Index of text-based rules (Commands, Text, Regex) for fast search of handlers.
+
+Instead of checking text rules of every handler one by one, dispatcher looks up
+a first word and a whole text of message in hash tables and checks all regexes
+with one combined pattern. Only handlers which may pass their text rule are checked then.
+"""
+import re
+import typing
+
+from .rules import Commands
+from .rules import Regex
+from .rules import Text
+
+_BACKREFERENCE = re.compile(r"\\\d|\(\?P=")
+_NAMED_GROUP = re.compile(r"(?<!\\)\(\?P<\w+>")
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def _prepare_pattern(pattern: str) -> str:
+    """
+    Make pattern suitable for combined pattern: names of groups may repeat in
+    other patterns and global flags are allowed only at the start of whole pattern.
+    :param pattern:
+    :return:
+    """
+    pattern = _NAMED_GROUP.sub("(?:", pattern)
+    match = _GLOBAL_FLAGS.match(pattern)
+    if match is not None:
+        # global flags of pattern are applied only to its group
+        pattern = f"(?{match.group(1)}:{pattern[match.end():]})"
+    return f"(?:{pattern})"
+
+
+class TextRouter:
+    def __init__(self, handlers: typing.List):
+        """
+
+        :param handlers: handlers of one event type in order of registration
+        """
+        self._handlers = handlers
+
+        self._always: typing.Set[int] = set()  # handlers without indexed rules
+        self._commands: typing.Dict[str, typing.Set[int]] = {}
+        self._commands_ignore_case: typing.Dict[str, typing.Set[int]] = {}
+        self._texts: typing.Dict[str, typing.Set[int]] = {}
+        self._texts_ignore_case: typing.Dict[str, typing.Set[int]] = {}
+        self._regexes: typing.List[typing.Tuple[typing.Pattern, int]] = []
+        self._combined_regex: typing.Optional[typing.Pattern] = None
+
+        for index, handler in enumerate(handlers):
+            for rule in handler.rules:
+                if self._index_rule(rule, index):
+                    break
+            else:
+                self._always.add(index)
+
+        self._compile_regexes()
+
+    @property
+    def has_text_rules(self) -> bool:
+        return len(self._always) != len(self._handlers)
+
+    @staticmethod
+    def _is_builtin(rule, rule_class) -> bool:
+        # subclasses which override 'check' may have other logic, they are not indexed.
+        return isinstance(rule, rule_class) and type(rule).check is rule_class.check
+
+    def _index_rule(self, rule, index: int) -> bool:
+        """
+        Add rule to index.
+        :param rule:
+        :param index: index of handler
+        :return: False if rule can't be indexed
+        """
+        if self._is_builtin(rule, Commands):
+            table = self._commands_ignore_case if rule.IGNORE_CASE else self._commands
+            for command in rule.commands:
+                for prefix in rule.prefix:
+                    table.setdefault(f"{prefix}{command}", set()).add(index)
+            return True
+
+        if self._is_builtin(rule, Text):
+            table = self._texts_ignore_case if rule.IGNORE_CASE else self._texts
+            table.setdefault(rule.text.lower(), set()).add(index)
+            return True
+
+        if self._is_builtin(rule, Regex):
+            self._regexes.append((rule.pattern, index))
+            return True
+
+        return False
+
+    def _compile_regexes(self):
+        patterns = [pattern.pattern for pattern, _ in self._regexes]
+        if not patterns or any(_BACKREFERENCE.search(p) for p in patterns):
+            return
+        try:
+            self._combined_regex = re.compile(
+                "|".join(_prepare_pattern(p) for p in patterns),
+                re.IGNORECASE | re.MULTILINE,
+            )
+        except re.error:
+            # patterns are checked one by one
+            self._combined_regex = None
+
+    def get_candidates(self, text: typing.Optional[str]) -> typing.List:
+        """
+        Returns handlers which may pass their text rule, in order of registration.
+        :param text: text of message
+        :return:
+        """
+        text = text or ""
+        lower_text = text.lower()
+        words = text.split()
+        first_word = words[0] if words else None
+
+        matched = set(self._always)
+        if first_word is not None:
+            matched.update(self._commands.get(first_word, ()))
+            matched.update(self._commands_ignore_case.get(first_word.lower(), ()))
+        matched.update(self._texts.get(text, ()))
+        matched.update(self._texts_ignore_case.get(lower_text, ()))
+
+        if self._regexes and (
+            self._combined_regex is None or self._combined_regex.search(lower_text)
+        ):
+            matched.update(
+                index
+                for pattern, index in self._regexes
+                if index not in matched and pattern.search(lower_text)
+            )
+
+        return [self._handlers[index] for index in sorted(matched)]
@@ -0,0 +1,75 @@
+"""
+Codecs of values for storages which keep bytes (e.g. RedisStorage).
+"""
+import pickle
+import typing
+from abc import ABC
+from abc import abstractmethod
+
+from vk.constants import JSON_LIBRARY
+
+
+class AbstractCodec(ABC):
+    @abstractmethod
+    def encode(self, value: typing.Any) -> typing.Any:
+        """
+        Encode value before placing to storage.
+        :param value:
+        :return: bytes, str or number
+        """
+
+    @abstractmethod
+    def decode(self, value: bytes) -> typing.Any:
+        """
+        Decode value got from storage.
+        :param value:
+        :return:
+        """
+
+
+class StrCodec(AbstractCodec):
+    """
+    Values are placed as is (str, bytes or numbers), got values are strings.
+    """
+
+    def encode(self, value: typing.Any) -> typing.Any:
+        return value
+
+    def decode(self, value: bytes) -> str:
+        return value.decode()
+
+
+class BytesCodec(AbstractCodec):
+    """
+    Values are bytes, without decoding.
+    """
+
+    def encode(self, value: bytes) -> bytes:
+        return value
+
+    def decode(self, value: bytes) -> bytes:
+        return value
+
+
+class JSONCodec(AbstractCodec):
+    """
+    Values are serialized to JSON, so numbers, lists and dicts are got with own types.
+    """
+
+    def encode(self, value: typing.Any) -> str:
+        return JSON_LIBRARY.dumps(value)
+
+    def decode(self, value: bytes) -> typing.Any:
+        return JSON_LIBRARY.loads(value)
+
+
+class PickleCodec(AbstractCodec):
+    """
+    Values are serialized with pickle. Use it only with trusted storage.
+    """
+
+    def encode(self, value: typing.Any) -> bytes:
+        return pickle.dumps(value)
+
+    def decode(self, value: bytes) -> typing.Any:
+        return pickle.loads(value)
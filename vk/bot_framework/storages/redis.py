@@ -2,12 +2,35 @@ import asyncio
 import typing
 
 from ..dispatcher.storage import AbstractAsyncExpiredStorage
+from ..dispatcher.storage import RateLimitResult
+from .codecs import AbstractCodec
+from .codecs import StrCodec
 
 try:
     import aioredis  # noqa
 except ImportError:
     aioredis = None
 
+# GCRA (look at vk.bot_framework.dispatcher.storage.gcra) with time of redis server.
+_RATE_LIMIT_SCRIPT = """
+redis.replicate_commands()
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + period / limit
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
 
 class RedisStorage(AbstractAsyncExpiredStorage):
     def __init__(
@@ -16,7 +39,22 @@ class RedisStorage(AbstractAsyncExpiredStorage):
         loop: asyncio.AbstractEventLoop,
         db: str = None,
         password: str = None,
+        *,
+        minsize: int = 1,
+        maxsize: int = 10,
+        codec: AbstractCodec = None,
     ):
+        """
+
+        :param address: address of redis
+        :param loop: event loop
+        :param db:
+        :param password:
+        :param minsize: min count of connections in pool
+        :param maxsize: max count of connections in pool
+        :param codec: codec of values. By default values are placed as is
+            and got as strings (look at vk.bot_framework.storages.codecs)
+        """
         if not aioredis:
             raise RuntimeError(
                 "For use this storage install aioredis (pip install aioredis)"
@@ -25,14 +63,21 @@ class RedisStorage(AbstractAsyncExpiredStorage):
         self._db = db
         self._password = password
         self._loop = loop
+        self._minsize = minsize
+        self._maxsize = maxsize
+        self.codec: AbstractCodec = codec if codec is not None else StrCodec()
         self.connection: typing.Optional["aioredis.Redis"] = None
+        self._connecting: typing.Optional[asyncio.Task] = None
+        self._rate_limit_sha: typing.Optional[str] = None
 
     async def create_connection(self) -> "aioredis.Redis":
         if not self.connection:
-            conn: aioredis.Redis = await aioredis.create_redis(
+            conn: aioredis.Redis = await aioredis.create_redis_pool(
                 address=self._address,
                 db=self._db,
                 password=self._password,
+                minsize=self._minsize,
+                maxsize=self._maxsize,
                 loop=self._loop,
             )
             self.connection = conn
@@ -40,42 +85,150 @@ class RedisStorage(AbstractAsyncExpiredStorage):
         else:
             raise RuntimeError("Connection already setuped")
 
+    async def get_connection(self) -> "aioredis.Redis":
+        """
+        Get pool of connections, it's created with first call.
+        :return:
+        """
+        if self.connection is None:
+            # concurrent first calls wait for one pool
+            if self._connecting is None:
+                self._connecting = self._loop.create_task(self.create_connection())
+            try:
+                await self._connecting
+            except Exception:
+                self._connecting = None  # next call tries again
+                raise
+        return self.connection
+
+    async def close(self):
+        """
+        Close pool of connections.
+        :return:
+        """
+        if self.connection is not None:
+            self.connection.close()
+            await self.connection.wait_closed()
+            self.connection = None
+            self._connecting = None
+
+    def _decode(self, value: typing.Optional[bytes], default: typing.Any) -> typing.Any:
+        if value is None:
+            return default
+        return self.codec.decode(value)
+
     async def place(
         self, key: typing.AnyStr, value: typing.Any, expire=0, pexpire=0
     ) -> None:
-        if not self.connection:
-            await self.create_connection()
-        await self.connection.set(key, value, expire=expire, pexpire=pexpire)
+        conn = await self.get_connection()
+        await conn.set(key, self.codec.encode(value), expire=expire, pexpire=pexpire)
 
     async def get(
         self, key: typing.AnyStr, default: typing.Any = None
     ) -> typing.Optional[typing.Any]:
-        if not self.connection:
-            await self.create_connection()
-        value = await self.connection.get(key)
-        if value is None:
-            return default
-        return value.decode()
+        conn = await self.get_connection()
+        return self._decode(await conn.get(key), default)
 
     async def update(self, key: typing.AnyStr, value: typing.Any, expire=0, pexpire=0):
-        if not self.connection:
-            await self.create_connection()
         await self.place(key, value, expire, pexpire)
 
     async def delete(
         self, key: typing.AnyStr, *keys: typing.Tuple[typing.AnyStr]
     ) -> None:
-        if not self.connection:
-            await self.create_connection()
-        await self.connection.delete(key, *keys)
+        conn = await self.get_connection()
+        await conn.delete(key, *keys)
 
     async def exists(
         self, key: typing.AnyStr, *keys: typing.Tuple[typing.AnyStr]
     ) -> bool:
-        if not self.connection:
-            await self.create_connection()
-        result = await self.connection.exists(key, *keys)
+        conn = await self.get_connection()
+        result = await conn.exists(key, *keys)
         if result == 0:
             return False
         else:
             return True
+
+    async def get_many(
+        self, keys: typing.Iterable[typing.AnyStr], default: typing.Any = None
+    ) -> typing.List[typing.Any]:
+        """
+        Get values by keys with one request (MGET).
+        :param keys:
+        :param default: value for keys which don't exist
+        :return: values in order of keys
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        conn = await self.get_connection()
+        return [self._decode(value, default) for value in await conn.mget(*keys)]
+
+    async def place_many(
+        self, values: typing.Dict[typing.AnyStr, typing.Any], expire=0, pexpire=0
+    ) -> None:
+        """
+        Place values with one transaction (MULTI/EXEC).
+        :param values: values by keys
+        :param expire:
+        :param pexpire:
+        :return:
+        """
+        if not values:
+            return
+        conn = await self.get_connection()
+        transaction = conn.multi_exec()
+        for key, value in values.items():
+            transaction.set(
+                key, self.codec.encode(value), expire=expire, pexpire=pexpire
+            )
+        await transaction.execute()
+
+    async def delete_many(self, keys: typing.Iterable[typing.AnyStr]) -> None:
+        """
+        Delete values by keys with one request.
+        :param keys:
+        :return:
+        """
+        keys = list(keys)
+        if keys:
+            await self.delete(*keys)
+
+    async def pipeline(
+        self, commands: typing.Callable[["aioredis.Redis"], typing.Any]
+    ) -> typing.List[typing.Any]:
+        """
+        Send several commands in one round trip (results aren't decoded).
+
+        >>> results = await storage.pipeline(lambda p: (p.get("a"), p.incr("b")))
+
+        :param commands: function which calls commands on pipeline
+        :return: results of commands
+        """
+        conn = await self.get_connection()
+        pipe = conn.pipeline()
+        commands(pipe)
+        return await pipe.execute()
+
+    async def rate_limit(
+        self, key: typing.AnyStr, limit: int, period: float
+    ) -> RateLimitResult:
+        """
+        Check and count call with one atomic request (lua script).
+        :param key:
+        :param limit: count of calls
+        :param period: period in seconds
+        :return:
+        """
+        conn = await self.get_connection()
+        if self._rate_limit_sha is None:
+            self._rate_limit_sha = await conn.script_load(_RATE_LIMIT_SCRIPT)
+        try:
+            allowed, retry_after = await conn.evalsha(
+                self._rate_limit_sha, keys=[key], args=[limit, period]
+            )
+        except aioredis.ReplyError as exc:
+            if "NOSCRIPT" not in str(exc):
+                raise
+            self._rate_limit_sha = None  # scripts of redis were flushed
+            return await self.rate_limit(key, limit, period)
+        return RateLimitResult(bool(allowed), float(retry_after))
@@ -1,59 +1,209 @@
+import asyncio
+import heapq
+import itertools
+import math
 import time
 import typing
+from collections import OrderedDict
 
 from ..dispatcher.storage import AbstractAsyncExpiredStorage
+from ..dispatcher.storage import gcra
+from ..dispatcher.storage import RateLimitResult
 
 """
 Special for caching.
 """
 
+_NEVER = float("inf")
 
-class ExpiringDict(dict):
-    def __init__(self, standart_ttl: int = 10):
+
+class ExpiringDictStats(typing.NamedTuple):
+    size: int  # count of keys
+    hits: int  # count of reads of existing keys
+    misses: int  # count of reads of missing or expired keys
+    expired: int  # count of keys removed after expiration
+    evictions: int  # count of keys removed by size limit
+
+    @property
+    def hit_rate(self) -> float:
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+
+class ExpiringDict(OrderedDict):
+    """
+    Dict with time to live of keys.
+
+    Expired keys are removed when they are read and with 'sweep' (it's called on every write,
+    so keys which are never read again don't stay in memory). With max size the least
+    recently used keys are evicted.
+    """
+
+    def __init__(self, standart_ttl: int = 10, max_size: int = 0):
+        """
+
+        :param standart_ttl: time to live of keys placed without ttl
+        :param max_size: max count of keys (0 - unlimited)
+        """
         super().__init__()
         self._standart_ttl: int = standart_ttl
+        self.max_size: int = max_size
+
+        # heap of (expiration time, counter, key), it may have outdated entries
+        self._expirations: typing.List[typing.Tuple[float, int, typing.Any]] = []
+        self._counter = itertools.count()
+
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
 
-    def __setitem__(self, key, value):
-        dict.__setitem__(self, key, value)
+    @property
+    def stats(self) -> ExpiringDictStats:
+        return ExpiringDictStats(
+            size=len(self),
+            hits=self._hits,
+            misses=self._misses,
+            expired=self._expired,
+            evictions=self._evictions,
+        )
 
     def set_with_ttl(self, key, value, ttl: int):
+        """
+        Set value with time to live.
+        :param key:
+        :param value:
+        :param ttl: time to live in seconds, -1 - without expiration,
+            by default standart ttl is used
+        :return:
+        """
+        now = time.time()
         if ttl and isinstance(ttl, int):
-            if ttl == -1:
-                ttl = time.time()
-            value = (value, time.time() + ttl)
+            expires_at = _NEVER if ttl == -1 else now + ttl
         else:
-            value = (value, time.time() + self._standart_ttl)
-        self[key] = value
+            expires_at = now + self._standart_ttl
+
+        self[key] = (value, expires_at)
+        self.move_to_end(key)
+        if expires_at != _NEVER:
+            heapq.heappush(self._expirations, (expires_at, next(self._counter), key))
+
+        self.sweep(now)
+        if self.max_size:
+            while len(self) > self.max_size:
+                self.popitem(last=False)  # the least recently used key
+                self._evictions += 1
+
+    def sweep(self, now: float = None) -> int:
+        """
+        Remove expired keys.
+        :param now: current time
+        :return: count of removed keys
+        """
+        if now is None:
+            now = time.time()
+        expirations = self._expirations
+        removed = 0
+        while expirations and expirations[0][0] <= now:
+            expires_at, _, key = heapq.heappop(expirations)
+            item = dict.get(self, key)
+            # key may be removed or placed again with other ttl
+            if item is not None and item[1] == expires_at:
+                del self[key]
+                removed += 1
+        self._expired += removed
+
+        if len(expirations) > 2 * len(self) + 64:
+            self._compact()
+        return removed
+
+    def _compact(self):
+        """
+        Rebuild heap of expirations without outdated entries.
+        :return:
+        """
+        self._expirations = [
+            (expires_at, next(self._counter), key)
+            for key, (_, expires_at) in dict.items(self)
+            if expires_at != _NEVER
+        ]
+        heapq.heapify(self._expirations)
+
+    def _get_item(self, key):
+        """
+        Get (value, expiration time) of alive key.
+        :param key:
+        :return:
+        """
+        item = dict.__getitem__(self, key)
+        if item[1] <= time.time():
+            del self[key]
+            self._expired += 1
+            raise KeyError(key)
+        self.move_to_end(key)
+        return item
 
     def __contains__(self, key):
         try:
-            item = self.__getitem__(key, with_ttl=True)
-            if item[1] < time.time():
-                del self[key]
-                return False
-            else:
-                return item
+            self._get_item(key)
         except KeyError:
             return False
+        return True
 
     def __getitem__(self, key, *, with_ttl=False):
-        item = dict.__getitem__(self, key)
-        if item[1] < time.time():
-            del self[key]
-            raise KeyError
-        else:
-            if with_ttl:
-                return item
-            return item[0]
+        item = self._get_item(key)
+        if with_ttl:
+            return item
+        return item[0]
+
+    def get(self, key, default=None):
+        try:
+            value = self._get_item(key)[0]
+        except KeyError:
+            self._misses += 1
+            return default
+        self._hits += 1
+        return value
 
 
 class TTLDictStorage(AbstractAsyncExpiredStorage):
-    def __init__(self):
-        self._storage: ExpiringDict = ExpiringDict()
+    def __init__(self, max_size: int = 0, sweep_interval: float = 60):
+        """
+
+        :param max_size: max count of keys, the least recently used keys are evicted (0 - unlimited)
+        :param sweep_interval: interval in seconds of removing of expired keys in background
+            (0 - only on writes)
+        """
+        self._storage: ExpiringDict = ExpiringDict(max_size=max_size)
+        self.sweep_interval: float = sweep_interval
+        self._sweeper: typing.Optional[asyncio.Task] = None
+
+    @property
+    def stats(self) -> ExpiringDictStats:
+        return self._storage.stats
+
+    def _start_sweeper(self):
+        if self._sweeper is None and self.sweep_interval:
+            self._sweeper = asyncio.get_event_loop().create_task(self._sweep_forever())
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self._storage.sweep()
+
+    async def close(self):
+        """
+        Stop background removing of expired keys.
+        :return:
+        """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
 
     async def place(
         self, key: typing.AnyStr, value: typing.Any, expire: int = -1
     ) -> None:
+        self._start_sweeper()
         if key in self._storage:
             raise RuntimeError("Storage already have this key.")
         self._storage.set_with_ttl(key, value, expire)
@@ -61,10 +211,7 @@ class TTLDictStorage(AbstractAsyncExpiredStorage):
     async def get(
         self, key: typing.AnyStr, default: typing.Any = None
     ) -> typing.Optional[typing.Any]:
-        if key in self._storage:
-            return self._storage[key]
-        else:
-            return default
+        return self._storage.get(key, default)
 
     async def delete(self, key: typing.AnyStr) -> None:
         if key in self._storage:
@@ -75,9 +222,21 @@ class TTLDictStorage(AbstractAsyncExpiredStorage):
     async def update(
         self, key: typing.AnyStr, value: typing.Any, expire: int = -1
     ) -> None:
+        self._start_sweeper()
         if key not in self._storage:
             raise RuntimeError("Storage don`t have this key.")
         self._storage.set_with_ttl(key, value, expire)
 
     async def exists(self, key: typing.AnyStr):
         return key in self._storage
+
+    async def rate_limit(
+        self, key: typing.AnyStr, limit: int, period: float
+    ) -> RateLimitResult:
+        # nothing is awaited here, so check and set are atomic for event loop.
+        now = time.time()
+        result, new_tat = gcra(self._storage.get(key), now, limit, period)
+        if result.allowed:
+            self._start_sweeper()
+            self._storage.set_with_ttl(key, new_tat, math.ceil(new_tat - now))
+        return result
@@ -72,8 +72,16 @@ def default_extensions() -> dict:
     Build and return dict of default dispatcher extensions
     :return:
     """
+    from vk.bot_framework.extensions import CallbackAPI
+    from vk.bot_framework.extensions import MultiPolling
     from vk.bot_framework.extensions import Polling
+    from vk.bot_framework.extensions import UserPolling
 
-    _default_extensions: dict = {"polling": Polling}
+    _default_extensions: dict = {
+        "polling": Polling,
+        "multi_polling": MultiPolling,
+        "callback_api": CallbackAPI,
+        "user_polling": UserPolling,
+    }
 
     return _default_extensions
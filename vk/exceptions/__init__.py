@@ -1,4 +1,5 @@
 from .errors import APIException
 from .errors import KeyboardException
+from .errors import LongPollException
 from .errors_dispatcher import APIErrorDispatcher
 from .errors_dispatcher import APIErrorHandler
@@ -4,3 +4,7 @@ class APIException(Exception):
 
 class KeyboardException(Exception):
     pass
+
+
+class LongPollException(Exception):
+    pass
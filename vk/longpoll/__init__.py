@@ -1 +1,3 @@
 from .bot.longpoll import BotLongPoll
+from .bot.multiplexer import MultiBotLongPoll
+from .user.longpoll import UserLongPoll
@@ -1 +1,2 @@
 from .longpoll import BotLongPoll
+from .multiplexer import MultiBotLongPoll
@@ -5,6 +5,8 @@ import typing
 from vk import VK
 from vk.constants import API_VERSION
 from vk.constants import JSON_LIBRARY
+from vk.exceptions import LongPollException
+from vk.longpoll.checkpoint import AbstractCheckpoint
 from vk.utils import mixins
 
 logger = logging.getLogger(__name__)
@@ -14,11 +16,20 @@ logger = logging.getLogger(__name__)
 
 
 class BotLongPoll(mixins.ContextInstanceMixin):
-    def __init__(self, group_id: int, vk: VK):
+    def __init__(
+        self,
+        group_id: int,
+        vk: VK,
+        checkpoint: AbstractCheckpoint = None,
+        on_history_expired: typing.Callable[[str, str], typing.Awaitable] = None,
+    ):
         """
 
         :param group_id:
         :param vk:
+        :param checkpoint: place for saving ts of processed events. Polling resumes from it.
+        :param on_history_expired: coroutine function (old_ts, new_ts) which is called
+            when VK doesn't have events after old ts anymore (they are lost).
         """
         self._vk: VK = vk
         self._group_id: int = group_id
@@ -26,6 +37,12 @@ class BotLongPoll(mixins.ContextInstanceMixin):
         self.key: typing.Optional[str] = None
         self.ts: typing.Optional[str] = None
 
+        self.checkpoint: typing.Optional[AbstractCheckpoint] = checkpoint
+        self.on_history_expired = on_history_expired
+        # ts of the last updates yielded by 'listen_pipelined'
+        self.yielded_ts: typing.Optional[str] = None
+        self._checkpoint_saving: typing.Optional[asyncio.Task] = None
+
         self.ran = False
 
     @property
@@ -42,15 +59,29 @@ class BotLongPoll(mixins.ContextInstanceMixin):
             {"group_id": self.group_id, "enabled": 1, "api_version": API_VERSION},
         )
         await self._update_polling()
+        await self._load_checkpoint()
 
-    async def _update_polling(self):
+    async def _load_checkpoint(self):
         """
+        Continue from saved ts, if it exists.
+        :return:
+        """
+        if self.checkpoint is not None:
+            saved_ts = await self.checkpoint.load()
+            if saved_ts is not None:
+                logger.info(f"Resume polling from saved ts: {saved_ts}")
+                self.ts = saved_ts
+
+    async def _update_polling(self, keep_ts: bool = False):
+        """
+        :param keep_ts: get new server and key, but continue from current ts
         :return:
         """
         resp = await self.get_server()
         self.server = resp["server"]
         self.key = resp["key"]
-        self.ts = resp["ts"]
+        if not keep_ts or self.ts is None:
+            self.ts = resp["ts"]
 
         logger.debug(
             f"Update polling credentials. Server - {self.server}. Key - {self.key}. TS - {self.ts}"
@@ -90,49 +121,173 @@ class BotLongPoll(mixins.ContextInstanceMixin):
             updates: typing.Optional[dict] = await self.get_updates(
                 key=self.key, server=self.server, ts=self.ts
             )
+            return await self._handle_updates(updates)
 
-            # Handle errors from vkontakte
-            if updates.get("failed"):
-                logger.debug(f"Longpolling responded with failed: {updates['failed']}")
+        except LongPollException:
+            raise
 
-                if updates["failed"] == 1:
-                    self.ts: str = updates["ts"]
-                elif updates["failed"] in (2, 3):
-                    await self._update_polling()
+        except Exception:  # noqa
+            logger.exception(
+                "Received exception while polling... Sleeping 10 seconds..."
+            )
 
-                return []
+            await asyncio.sleep(10)
+            await self._update_polling(keep_ts=True)
 
-            if "ts" not in updates or "updates" not in updates:
-                raise Exception("Vkontakte responded with incorrect response")
+            return []
 
-            self.ts: str = updates["ts"]
+    async def _handle_updates(self, updates: dict) -> typing.List[dict]:
+        """
+        Handle response of polling server.
+        :param updates: response of polling server
+        :return: list of updates
+        """
+        # Handle errors from vkontakte
+        if updates.get("failed"):
+            logger.debug(f"Longpolling responded with failed: {updates['failed']}")
 
-            logger.debug(f"Got updates through polling: {updates['updates']}")
+            if updates["failed"] == 1:
+                await self._history_expired(updates["ts"])
+            elif updates["failed"] == 2:
+                await self._update_polling(keep_ts=True)
+            elif updates["failed"] == 3:
+                await self._update_polling()
 
-            return updates["updates"]
+            return []
+
+        if "ts" not in updates or "updates" not in updates:
+            raise Exception("Vkontakte responded with incorrect response")
+
+        self.ts: str = updates["ts"]
+
+        logger.debug(f"Got updates through polling: {updates['updates']}")
+
+        return updates["updates"]
+
+    async def _history_expired(self, new_ts: str):
+        """
+        Called when polling server doesn't have events after current ts.
+        :param new_ts: ts which polling server returned
+        :return:
+        """
+        old_ts, self.ts = self.ts, new_ts
+        logger.warning(
+            f"History of events expired, events after ts {old_ts} are lost. "
+            f"Continue from ts {new_ts}"
+        )
+        if self.on_history_expired is not None:
+            try:
+                await self.on_history_expired(old_ts, new_ts)
+            except Exception:  # noqa
+                logger.exception("Error in 'on_history_expired' callback:")
 
+    async def save_checkpoint(self, ts: str = None):
+        """
+        Save ts of processed events to checkpoint.
+        :param ts: by default current ts
+        :return:
+        """
+        if self.checkpoint is None:
+            return
+        try:
+            await self.checkpoint.save(ts if ts is not None else self.ts)
         except Exception:  # noqa
-            logger.exception(
-                "Received exception while polling... Sleeping 10 seconds..."
-            )
+            logger.exception("Error while saving polling checkpoint:")
 
-            await asyncio.sleep(10)
-            await self._update_polling()
+    def save_checkpoint_after(self, processed: typing.Awaitable, ts: str = None):
+        """
+        Save ts in background when updates are processed. Checkpoints are saved
+        in order of calls, so ts isn't saved while earlier updates are processed.
 
-            return []
+        >>> processed = await dp._process_events(events)
+        >>> longpoll.save_checkpoint_after(processed)
 
-    async def run(self) -> dict:
+        :param processed: awaitable which is done when updates are processed
+        :param ts: by default current ts
+        :return:
         """
+        if self.checkpoint is None:
+            return
+        ts = ts if ts is not None else self.ts
+        previous = self._checkpoint_saving
+
+        async def save():
+            await processed
+            if previous is not None:
+                await previous
+            await self.save_checkpoint(ts)
 
-        :return: last update coming from VK
+        self._checkpoint_saving = self.vk.loop.create_task(save())
+
+    async def _produce_updates(self, queue: asyncio.Queue):
+        """
+        Get updates and put them to queue.
+        Next request is sent right after previous response, while updates are processed.
+        Error which stops polling is put to queue too.
+        :param queue:
+        :return:
+        """
+        try:
+            while True:
+                events = await self.listen()
+                if events:
+                    await queue.put((self.ts, events))
+        except Exception as exc:
+            # consumer raises it after updates which came earlier.
+            await queue.put((None, exc))
+
+    async def listen_pipelined(
+        self, queue_size: int = 10, save_checkpoints: bool = True
+    ) -> typing.AsyncIterator[typing.List[dict]]:
+        """
+        Get lists of updates without gaps between requests to polling server.
+        Lists of updates wait in bounded queue (in order of coming),
+        when queue is full next request isn't sent.
+
+        >>> async for events in longpoll.listen_pipelined():
+        >>>     await dp._process_events(events)
+
+        :param queue_size: max count of lists of updates which wait for processing
+        :param save_checkpoints: save ts of updates when consumer asks next updates.
+            Consumers which process updates in background save it themselves
+            with 'save_checkpoint_after' (ts of yielded updates is in 'yielded_ts').
+        :return: lists of updates coming from VK
+        """
+        queue: asyncio.Queue = asyncio.Queue(queue_size)
+        producer = self.vk.loop.create_task(self._produce_updates(queue))
+        try:
+            while True:
+                ts, events = await queue.get()
+                if isinstance(events, Exception):
+                    raise events
+                self.yielded_ts = ts
+                yield events
+                if save_checkpoints:
+                    # consumer asks next events, so these events are processed.
+                    await self.save_checkpoint(ts)
+        finally:
+            producer.cancel()
+
+    async def run(self, pipelined: bool = False) -> dict:
+        """
+
+        :param pipelined: send next request to polling server while updates are processed
+        :return: updates coming from VK (one by one, in order of coming)
         """
 
         await self._prepare_longpoll()
         self.ran = True
         logger.info("Polling started!")
 
+        if pipelined:
+            async for events in self.listen_pipelined():
+                for event in events:
+                    yield event
+            return
+
         while True:
             events = await self.listen()
-            while events:
-                event = events.pop()
+            for event in events:
                 yield event
+            if events:
+                await self.save_checkpoint()
@@ -0,0 +1,221 @@
+"""
+Polling of many communities in one process.
+
+All communities share one aiohttp session (and pool of connections). Requests to polling
+servers are run concurrently, but errors, retries and refreshes of polling servers
+are handled by one loop - community which waits for retry doesn't hold a sleeping task.
+
+>>> longpoll = MultiBotLongPoll({group_id: access_token, other_group_id: other_access_token})
+>>> async for events in longpoll.run():
+>>>     ...  # events of one community, every event has 'group_id' of its community
+"""
+import asyncio
+import heapq
+import logging
+import typing
+
+from aiohttp import ClientSession
+from aiohttp import TCPConnector
+
+from .longpoll import BotLongPoll
+from vk import VK
+from vk.constants import JSON_LIBRARY
+from vk.longpoll.checkpoint import AbstractCheckpoint
+from vk.methods import API
+
+logger = logging.getLogger(__name__)
+
+
+class MultiBotLongPoll:
+    def __init__(
+        self,
+        communities: typing.Dict[int, str] = None,
+        *,
+        loop: asyncio.AbstractEventLoop = None,
+        client: ClientSession = None,
+        connections_limit: int = 0,
+        error_delay: float = 10,
+        max_error_delay: float = 300,
+    ):
+        """
+
+        :param communities: access tokens of communities by ids of communities
+        :param loop: asyncio event loop
+        :param client: shared aiohttp client session. By default new session is created.
+        :param connections_limit: max count of connections of created session (0 - unlimited).
+            Every community holds one connection while waits for events.
+        :param error_delay: time in seconds before retry of community after error
+        :param max_error_delay: max time before retry, delay doubles with every error in a row
+        """
+        self.loop = loop if loop is not None else asyncio.get_event_loop()
+        self.client = (
+            client
+            if client is not None
+            else ClientSession(
+                connector=TCPConnector(limit=connections_limit),
+                json_serialize=JSON_LIBRARY.dumps,
+            )
+        )
+        self.error_delay: float = error_delay
+        self.max_error_delay: float = max_error_delay
+
+        self._longpolls: typing.Dict[int, BotLongPoll] = {}
+        self._pending: typing.Dict[asyncio.Task, int] = {}  # requests in flight
+        # heap of (time of retry, group_id)
+        self._retries: typing.List[typing.Tuple[float, int]] = []
+        self._errors: typing.Dict[int, int] = {}  # count of errors in a row
+        self._refresh: typing.Set[int] = set()  # communities which need new key
+        self._wakeup: typing.Optional[asyncio.Event] = None
+
+        for group_id, access_token in (communities or {}).items():
+            self.add_community(group_id, access_token)
+
+    @property
+    def group_ids(self) -> typing.List[int]:
+        return list(self._longpolls)
+
+    def get_longpoll(self, group_id: int) -> BotLongPoll:
+        return self._longpolls[group_id]
+
+    def get_vk(self, group_id: int) -> VK:
+        return self._longpolls[group_id].vk
+
+    def add_community(
+        self,
+        group_id: int,
+        access_token: str,
+        checkpoint: AbstractCheckpoint = None,
+        on_history_expired: typing.Callable[[str, str], typing.Awaitable] = None,
+    ) -> BotLongPoll:
+        """
+        Add community. May be called while polling is running.
+        :param group_id: id of community
+        :param access_token: access token of community
+        :param checkpoint: place for saving ts of processed events of community
+        :param on_history_expired: look at BotLongPoll
+        :return:
+        """
+        if group_id in self._longpolls:
+            raise RuntimeError(f"Community {group_id} is already added")
+
+        current_vk = VK.get_current()
+        current_api = API.get_current()
+        vk = VK(access_token, loop=self.loop, client=self.client)
+        if current_vk is not None:
+            # new VK instance sets itself as current, restore previous one.
+            VK.set_current(current_vk)
+            API.set_current(current_api)
+
+        longpoll = BotLongPoll(
+            group_id, vk, checkpoint=checkpoint, on_history_expired=on_history_expired
+        )
+        self._longpolls[group_id] = longpoll
+        if self._wakeup is not None:
+            self._start(group_id)
+            self._wakeup.set()
+        return longpoll
+
+    def _start(self, group_id: int):
+        task = self.loop.create_task(self._poll(self._longpolls[group_id]))
+        self._pending[task] = group_id
+
+    def _retry_later(self, group_id: int, exc: Exception):
+        errors = self._errors[group_id] = self._errors.get(group_id, 0) + 1
+        delay = min(self.error_delay * 2 ** min(errors - 1, 16), self.max_error_delay)
+        logger.warning(
+            f"Error while polling community {group_id}: {exc!r}. Retry in {delay} seconds"
+        )
+        self._refresh.add(group_id)
+        heapq.heappush(self._retries, (self.loop.time() + delay, group_id))
+
+    async def _poll(self, longpoll: BotLongPoll) -> typing.List[dict]:
+        """
+        One request to polling server of community.
+        :param longpoll:
+        :return: list of updates
+        """
+        if longpoll.server is None:
+            await longpoll._prepare_longpoll()
+        elif longpoll.group_id in self._refresh:
+            await longpoll._update_polling(keep_ts=True)
+        self._refresh.discard(longpoll.group_id)
+
+        updates = await longpoll.get_updates(
+            key=longpoll.key, server=longpoll.server, ts=longpoll.ts
+        )
+        return await longpoll._handle_updates(updates)
+
+    async def run(
+        self, save_checkpoints: bool = True
+    ) -> typing.AsyncIterator[typing.List[dict]]:
+        """
+        Poll all communities. Events of every community come in order.
+        Next request of community is sent right after previous response, while events are processed.
+
+        :param save_checkpoints: save ts of updates when consumer asks next updates.
+            Consumers which process updates in background save it themselves with
+            'save_checkpoint_after' of polling of community (ts is in its 'yielded_ts').
+        :return: lists of updates of one community
+        """
+        self._wakeup = asyncio.Event()
+        wakeup = self.loop.create_task(self._wakeup.wait())
+        for group_id in self._longpolls:
+            self._start(group_id)
+        logger.info(f"Polling of {len(self._longpolls)} communities started!")
+
+        try:
+            while True:
+                now = self.loop.time()
+                while self._retries and self._retries[0][0] <= now:
+                    _, group_id = heapq.heappop(self._retries)
+                    self._start(group_id)
+                timeout = self._retries[0][0] - now if self._retries else None
+
+                done, _ = await asyncio.wait(
+                    [*self._pending, wakeup],
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if wakeup.done():
+                    self._wakeup.clear()
+                    wakeup = self.loop.create_task(self._wakeup.wait())
+
+                for task in done:
+                    group_id = self._pending.pop(task, None)
+                    if group_id is None:
+                        continue
+                    try:
+                        events = task.result()
+                    except Exception as exc:  # noqa
+                        self._retry_later(group_id, exc)
+                        continue
+
+                    self._errors.pop(group_id, None)
+                    longpoll = self._longpolls[group_id]
+                    ts = longpoll.ts
+                    self._start(group_id)
+                    if not events:
+                        continue
+
+                    for event in events:
+                        event.setdefault("group_id", group_id)
+                    longpoll.yielded_ts = ts
+                    yield events
+                    if save_checkpoints:
+                        # consumer asks next events, so these events are processed.
+                        await longpoll.save_checkpoint(ts)
+        finally:
+            wakeup.cancel()
+            for task in self._pending:
+                task.cancel()
+            self._pending.clear()
+            self._retries.clear()
+            self._wakeup = None
+
+    async def close(self):
+        """
+        Close shared aiohttp client session.
+        :return:
+        """
+        if not self.client.closed:
+            await self.client.close()
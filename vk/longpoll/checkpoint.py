@@ -0,0 +1,104 @@
+"""
+Checkpoints of long-poll 'ts' for resuming polling after restart without lost events.
+
+>>> checkpoint = FileCheckpoint("longpoll_ts.txt")
+>>> dp.run_polling(checkpoint=checkpoint)
+
+VK keeps history of events for limited time. If saved 'ts' is too old,
+polling server responds with 'failed': 1 and events of this period are lost.
+"""
+import asyncio
+import logging
+import os
+import typing
+from abc import ABC
+from abc import abstractmethod
+
+if typing.TYPE_CHECKING:
+    from vk.bot_framework.dispatcher.storage import AbstractAsyncStorage  # noqa
+    from vk.bot_framework.dispatcher.storage import AbstractStorage  # noqa
+
+logger = logging.getLogger(__name__)
+
+
+class AbstractCheckpoint(ABC):
+    @abstractmethod
+    async def load(self) -> typing.Optional[str]:
+        """
+        Load last saved ts.
+        :return: None if ts wasn't saved
+        """
+
+    @abstractmethod
+    async def save(self, ts: str) -> None:
+        """
+        Save ts of last processed events.
+        :param ts:
+        :return:
+        """
+
+
+class StorageCheckpoint(AbstractCheckpoint):
+    """
+    Keep ts in dispatcher storage (e.g. RedisStorage).
+    """
+
+    def __init__(
+        self,
+        storage: typing.Union["AbstractAsyncStorage", "AbstractStorage"],
+        key: str = "__longpoll_ts__",
+    ):
+        """
+
+        :param storage: any sync or async storage
+        :param key: key of ts in storage (must be unique for every community)
+        """
+        self._storage = storage
+        self._key = key
+        self._is_async = asyncio.iscoroutinefunction(storage.get)
+
+    async def _call(self, method: str, *args):
+        result = getattr(self._storage, method)(*args)
+        if self._is_async:
+            result = await result
+        return result
+
+    async def load(self) -> typing.Optional[str]:
+        ts = await self._call("get", self._key)
+        if isinstance(ts, bytes):
+            ts = ts.decode()
+        return str(ts) if ts is not None else None
+
+    async def save(self, ts: str) -> None:
+        if await self._call("exists", self._key):
+            await self._call("update", self._key, ts)
+        else:
+            await self._call("place", self._key, ts)
+
+
+class FileCheckpoint(AbstractCheckpoint):
+    """
+    Keep ts in local file.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def _read(self) -> typing.Optional[str]:
+        try:
+            with open(self._path) as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write(self, ts: str):
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(str(ts))
+        os.replace(tmp_path, self._path)  # atomic, file is never half-written
+
+    async def load(self) -> typing.Optional[str]:
+        return await asyncio.get_event_loop().run_in_executor(None, self._read)
+
+    async def save(self, ts: str) -> None:
+        await asyncio.get_event_loop().run_in_executor(None, self._write, ts)
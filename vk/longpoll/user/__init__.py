@@ -0,0 +1 @@
+from .longpoll import UserLongPoll
@@ -0,0 +1,97 @@
+import logging
+import typing
+
+from vk import VK
+from vk.constants import JSON_LIBRARY
+from vk.exceptions import LongPollException
+from vk.longpoll.bot.longpoll import BotLongPoll
+from vk.longpoll.checkpoint import AbstractCheckpoint
+from vk.longpoll.user.updates import decode_updates
+
+logger = logging.getLogger(__name__)
+
+
+# https://vk.com/dev/using_longpoll
+
+# attachments (2) + extended set of events (8) + extra fields of online (64) + random_id (128)
+DEFAULT_MODE = 2 | 8 | 64 | 128
+DEFAULT_VERSION = 3
+
+
+class UserLongPoll(BotLongPoll):
+    """
+    Long poll of user. Updates are decoded into events with the same layout
+    as events of communities (look at vk.longpoll.user.updates).
+
+    >>> longpoll = UserLongPoll(vk)
+    >>> async for event in longpoll.run():
+    >>>     print(event["type"], event["object"])
+    """
+
+    def __init__(
+        self,
+        vk: VK,
+        mode: int = DEFAULT_MODE,
+        version: int = DEFAULT_VERSION,
+        wait: int = 25,
+        checkpoint: AbstractCheckpoint = None,
+        on_history_expired: typing.Callable[[str, str], typing.Awaitable] = None,
+    ):
+        """
+
+        :param vk: VK object with access token of user
+        :param mode: sum of flags of additional data in updates
+        :param version: version of long poll
+        :param wait: time in seconds of waiting for updates
+        :param checkpoint: place for saving ts of processed events. Polling resumes from it.
+        :param on_history_expired: look at BotLongPoll
+        """
+        super().__init__(
+            None, vk, checkpoint=checkpoint, on_history_expired=on_history_expired
+        )
+        self.mode: int = mode
+        self.version: int = version
+        self.wait: int = wait
+
+    async def _prepare_longpoll(self):
+        await self._update_polling()
+        await self._load_checkpoint()
+
+    async def get_server(self) -> dict:
+        """
+        Get polling server.
+        :return:
+        """
+        resp = await self.vk.api_request(
+            "messages.getLongPollServer", params={"lp_version": self.version}
+        )
+        return resp
+
+    async def get_updates(self, key: str, server: str, ts: str) -> dict:
+        """
+        Get updates from VK.
+        :param key:
+        :param server:
+        :param ts:
+        :return:
+        """
+        async with self.vk.client.get(
+            f"https://{server}?act=a_check&key={key}&ts={ts}&wait={self.wait}"
+            f"&mode={self.mode}&version={self.version}"
+        ) as response:
+            resp = await response.json(loads=JSON_LIBRARY.loads, content_type=None)
+            logger.debug(f"Response from polling: {resp}")
+            return resp
+
+    async def _handle_updates(self, updates: dict) -> typing.List[dict]:
+        """
+        Handle response of polling server and decode updates.
+        :param updates: response of polling server
+        :return: list of events
+        """
+        if updates.get("failed") == 4:
+            raise LongPollException(
+                f"Version {self.version} of long poll isn't supported. "
+                f"Supported versions: {updates.get('min_version')} - {updates.get('max_version')}"
+            )
+        return decode_updates(await super()._handle_updates(updates))
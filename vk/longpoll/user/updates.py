@@ -0,0 +1,124 @@
+"""
+Decoding of user long poll updates (https://vk.com/dev/using_longpoll).
+
+Updates come as compact arrays: [code, field, field, ...]. They are decoded into events
+with the same layout as events of communities ({"type": ..., "object": {...}}),
+so dispatcher handles them in usual way. Objects are plain dicts - models are built
+by dispatcher only for events which have handlers.
+
+New, outgoing and edited messages are decoded into objects of Message model.
+Attachments of messages come in long poll format and are kept in 'lp_attachments'
+of raw event object, full attachments may be got with 'messages.getById'.
+"""
+import html
+import typing
+
+from vk.types.events.user.events_list import UserEvent
+
+OUTBOX = 2  # flag of outgoing message
+
+_UPDATES: typing.Dict[int, typing.Tuple[UserEvent, typing.Tuple[str, ...]]] = {
+    1: (UserEvent.MESSAGE_FLAGS_REPLACE, ("message_id", "flags", "peer_id")),
+    2: (UserEvent.MESSAGE_FLAGS_SET, ("message_id", "flags", "peer_id")),
+    3: (UserEvent.MESSAGE_FLAGS_RESET, ("message_id", "flags", "peer_id")),
+    6: (UserEvent.MESSAGES_READ_IN, ("peer_id", "local_id")),
+    7: (UserEvent.MESSAGES_READ_OUT, ("peer_id", "local_id")),
+    8: (UserEvent.FRIEND_ONLINE, ("user_id", "extra", "timestamp")),
+    9: (UserEvent.FRIEND_OFFLINE, ("user_id", "flags", "timestamp")),
+    10: (UserEvent.PEER_FLAGS_RESET, ("peer_id", "flags")),
+    11: (UserEvent.PEER_FLAGS_REPLACE, ("peer_id", "flags")),
+    12: (UserEvent.PEER_FLAGS_SET, ("peer_id", "flags")),
+    13: (UserEvent.MESSAGES_DELETE, ("peer_id", "local_id")),
+    14: (UserEvent.MESSAGES_RESTORE, ("peer_id", "local_id")),
+    51: (UserEvent.CHAT_EDIT, ("chat_id", "self")),
+    52: (UserEvent.CHAT_INFO_EDIT, ("type_id", "peer_id", "info")),
+    61: (UserEvent.USER_TYPING, ("user_id", "flags")),
+    62: (UserEvent.USER_TYPING_IN_CHAT, ("user_id", "chat_id")),
+    63: (UserEvent.USERS_TYPING, ("peer_id", "user_ids", "total_count", "ts")),
+    64: (UserEvent.USERS_RECORDING_AUDIO, ("peer_id", "user_ids", "total_count", "ts")),
+    70: (UserEvent.USER_CALL, ("user_id", "call_id")),
+    80: (UserEvent.COUNTER_UPDATE, ("count", "count_with_notifications")),
+    114: (UserEvent.NOTIFICATIONS_SETTINGS_UPDATE, ("settings",)),
+}
+
+
+def _decode_message(update: list) -> dict:
+    """
+    Decode new or edited message:
+    [code, message_id, flags, peer_id, timestamp, text, extra, attachments,
+    random_id, conversation_message_id, edit_time]
+    """
+    length = len(update)
+    flags = update[2]
+    peer_id = update[3]
+    extra = update[6] if length > 6 and isinstance(update[6], dict) else {}
+    out = bool(flags & OUTBOX)
+
+    if "from" in extra:  # chats
+        from_id = int(extra["from"])
+    elif not out:
+        from_id = peer_id
+    else:
+        from_id = None  # outgoing message in dialog, it is sent by current user
+
+    text = update[5] if length > 5 else ""
+    if "&" in text or "<br>" in text:
+        text = html.unescape(text.replace("<br>", "\n"))
+
+    if update[0] == 5:
+        event_type = UserEvent.MESSAGE_EDIT
+    elif out:
+        event_type = UserEvent.MESSAGE_REPLY
+    else:
+        event_type = UserEvent.MESSAGE_NEW
+
+    return {
+        "type": event_type.value,
+        "object": {
+            "id": update[1],
+            "date": update[4],
+            "peer_id": peer_id,
+            "from_id": from_id,
+            "text": text,
+            "random_id": update[8] if length > 8 else None,
+            "conversation_message_id": update[9] if length > 9 else None,
+            "out": int(out),
+            "flags": flags,
+            "payload": extra.get("payload"),
+            "title": extra.get("title"),
+            "lp_attachments": update[7] if length > 7 else {},
+        },
+    }
+
+
+def decode_update(update: list) -> dict:
+    """
+    Decode one update of user long poll.
+    :param update: array from long poll server
+    :return: event
+    """
+    code = update[0]
+    if code in (4, 5):
+        return _decode_message(update)
+
+    known = _UPDATES.get(code)
+    if known is None:
+        return {
+            "type": UserEvent.UNKNOWN.value,
+            "object": {"code": code, "update": update},
+        }
+
+    event_type, fields = known
+    obj = dict(zip(fields, update[1:]))
+    if code in (8, 9):
+        obj["user_id"] = -obj["user_id"]  # VK sends negative id of friend
+    return {"type": event_type.value, "object": obj}
+
+
+def decode_updates(updates: typing.List[list]) -> typing.List[dict]:
+    """
+    Decode list of updates of user long poll.
+    :param updates:
+    :return: events
+    """
+    return [decode_update(update) for update in updates]
@@ -1,11 +1,30 @@
+"""
+Streaming API (https://vk.com/dev/streaming_api).
+
+Frames are read from websocket by background task into bounded buffer,
+connection is restored automatically. Events may be read one by one or in batches:
+
+>>> stream = Streaming(vk, lazy_events=True)
+>>> await stream.get_server()
+>>> async for batch in stream.batches(500, timeout=1):
+>>>     ...
+"""
+import asyncio
+import logging
 import typing
 
+import aiohttp
+
 from ..vk import VK
 from ..constants import JSON_LIBRARY
 
 from vk.types.attachments import Attachment
 from vk.types.attachments.geo import Geo
 from ..types.base import BaseModel
+from ..types.lazy import make_lazy
+from vk.utils.overflow import OverflowPolicy
+
+logger = logging.getLogger(__name__)
 
 
 class StreamingRule(BaseModel):
@@ -65,7 +84,7 @@ class StreamingEvent(BaseModel):
     attachments: typing.List[Attachment] = []
     geo: Geo = None
     shared_post_text: str = None
-    shared_post_creation_time: int
+    shared_post_creation_time: int = None
     signer_id: int = None
     tags: typing.List[str] = []
     author: Author = None
@@ -76,12 +95,64 @@ class StreamingReadResponse(StreamingResponse):
     event: StreamingEvent = None
 
 
+class StreamingStats(typing.NamedTuple):
+    received: int  # count of received events
+    dropped: int  # count of events dropped by overflow policy
+    buffered: int  # count of events which wait in buffer
+    reconnects: int  # count of reconnections to streaming server
+
+
 class Streaming:
-    def __init__(self, vk: VK):
+    def __init__(
+        self,
+        vk: VK,
+        *,
+        lazy_events: bool = False,
+        buffer_size: int = 10000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.WAIT,
+        heartbeat: float = 30,
+        reconnect_delay: float = 1,
+        max_reconnect_delay: float = 60,
+    ):
+        """
+
+        :param vk: VK object
+        :param lazy_events: build lazy models, nested models are validated on first access
+        :param buffer_size: max count of events which wait for reading
+        :param overflow_policy: what to do with coming event when buffer is full
+            ('wait' stops reading of websocket)
+        :param heartbeat: interval in seconds of ping of streaming server
+        :param reconnect_delay: time in seconds before reconnection,
+            it doubles with every failed reconnection in a row
+        :param max_reconnect_delay: max time before reconnection
+        """
         self.vk: VK = vk
         self._server = None
         self._server_ws = None
 
+        self.lazy_events: bool = lazy_events
+        self.buffer_size: int = buffer_size
+        self.overflow_policy: OverflowPolicy = OverflowPolicy(overflow_policy)
+        self.heartbeat: float = heartbeat
+        self.reconnect_delay: float = reconnect_delay
+        self.max_reconnect_delay: float = max_reconnect_delay
+
+        self._buffer: typing.Optional[asyncio.Queue] = None
+        self._reader: typing.Optional[asyncio.Task] = None
+        self._received = 0
+        self._dropped = 0
+        self._reconnects = 0
+        self._errors = 0  # failed connections in a row
+
+    @property
+    def stats(self) -> StreamingStats:
+        return StreamingStats(
+            received=self._received,
+            dropped=self._dropped,
+            buffered=self._buffer.qsize() if self._buffer is not None else 0,
+            reconnects=self._reconnects,
+        )
+
     async def get_server(self):
         resp = await self.vk.api_request("streaming.getServerUrl")
         endpoint = resp["endpoint"]
@@ -106,8 +177,114 @@ class Streaming:
             json = await resp.json(loads=JSON_LIBRARY.loads)
             return StreamingAddResponse(**json)
 
-    async def read(self):
-        async with self.vk.client.ws_connect(self._server_ws) as ws:
+    def start(self):
+        """
+        Run reading of websocket to buffer. Called automatically by read and batches.
+        :return:
+        """
+        if self._reader is not None:
+            return
+        self._buffer = asyncio.Queue(self.buffer_size)
+        self._reader = self.vk.loop.create_task(self._read_forever())
+
+    async def close(self):
+        """
+        Stop reading of websocket. Events in buffer are lost.
+        :return:
+        """
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self._reader = None
+        self._buffer = None
+
+    async def _put(self, data: dict):
+        self._received += 1
+        if not self._buffer.full() or self.overflow_policy is OverflowPolicy.WAIT:
+            await self._buffer.put(data)
+            return
+
+        self._dropped += 1
+        if self.overflow_policy is OverflowPolicy.DROP_OLD:
+            self._buffer.get_nowait()
+            self._buffer.put_nowait(data)
+
+    async def _read_ws(self):
+        async with self.vk.client.ws_connect(
+            self._server_ws, heartbeat=self.heartbeat
+        ) as ws:
+            logger.info("Connected to streaming server")
+            self._errors = 0
             async for msg in ws:
-                data = JSON_LIBRARY.loads(msg)
-                yield StreamingReadResponse(**data)
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    await self._put(JSON_LIBRARY.loads(msg.data))
+                elif msg.type == aiohttp.WSMsgType.ERROR:
+                    raise ws.exception()
+
+    async def _read_forever(self):
+        while True:
+            try:
+                if self._server_ws is None:
+                    await self.get_server()
+                await self._read_ws()
+                logger.warning("Streaming server closed connection")
+            except aiohttp.WSServerHandshakeError as exc:
+                logger.warning(f"Streaming server rejected connection: {exc!r}")
+                self._server_ws = None  # key may be expired, get new server
+            except Exception as exc:  # noqa
+                logger.warning(f"Error while reading streaming: {exc!r}")
+
+            self._errors += 1
+            self._reconnects += 1
+            delay = min(
+                self.reconnect_delay * 2 ** min(self._errors - 1, 16),
+                self.max_reconnect_delay,
+            )
+            logger.info(f"Reconnect to streaming server in {delay} seconds")
+            await asyncio.sleep(delay)
+
+    def _build(self, data: dict) -> StreamingReadResponse:
+        if self.lazy_events:
+            return make_lazy(StreamingReadResponse, data)
+        return StreamingReadResponse(**data)
+
+    async def read(
+        self, raw: bool = False
+    ) -> typing.AsyncIterator[typing.Union[StreamingReadResponse, dict]]:
+        """
+        Read events one by one.
+        :param raw: yield decoded dicts without building of models
+        :return:
+        """
+        self.start()
+        while True:
+            data = await self._buffer.get()
+            yield data if raw else self._build(data)
+
+    async def batches(
+        self, size: int = 100, timeout: float = 1, raw: bool = False
+    ) -> typing.AsyncIterator[typing.List[typing.Union[StreamingReadResponse, dict]]]:
+        """
+        Read events in batches.
+        :param size: max count of events in batch
+        :param timeout: max time in seconds of waiting for full batch after first event
+        :param raw: yield decoded dicts without building of models
+        :return:
+        """
+        self.start()
+        loop = self.vk.loop
+        while True:
+            batch = [await self._buffer.get()]
+            deadline = loop.time() + timeout
+            while len(batch) < size:
+                if not self._buffer.empty():
+                    batch.append(self._buffer.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._buffer.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            yield batch if raw else [self._build(data) for data in batch]
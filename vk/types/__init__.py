@@ -3,6 +3,7 @@ from . import attachments
 from .base import BaseModel
 from .community import Community
 from .events.community.events_list import Event as BotEvent
+from .events.user.events_list import UserEvent
 from .message import Action
 from .message import Message
 from .user import User
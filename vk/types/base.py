@@ -1,13 +1,102 @@
+import copy
+import typing
+
 import pydantic
 
 from vk.utils.mixins import ContextInstanceMixin
 
+_trusted_construction: bool = False
+
+
+def set_trusted_construction(enabled: bool):
+    """
+    Globally enable or disable trusted construction of models.
+    In trusted mode models are built without validation and coercion (like 'construct'),
+    only declared nested models are built from dicts.
+    Use it only for data which comes from VK and matches the schema.
+    :param enabled:
+    :return:
+    """
+    global _trusted_construction
+    _trusted_construction = enabled
+
+
+def is_trusted_construction() -> bool:
+    """
+    Check trusted construction is enabled globally or for current VK instance.
+    :return:
+    """
+    if _trusted_construction:
+        return True
+    from vk import VK
+
+    vk = VK.get_current()
+    return vk is not None and vk.trusted_models
+
+
+class _ConstructionPlan(typing.NamedTuple):
+    defaults: dict  # name of field -> default value
+    mutable_defaults: typing.Tuple[str, ...]  # fields which default must be copied
+    fields: dict  # alias of field -> (name of field, nested model or None)
+
+
+_construction_plans: typing.Dict[type, _ConstructionPlan] = {}
+
+
+def _get_construction_plan(model: type) -> _ConstructionPlan:
+    plan = _construction_plans.get(model)
+    if plan is None:
+        defaults, mutable_defaults, fields = {}, [], {}
+        for name, field in model.__fields__.items():
+            defaults[name] = field.default
+            if isinstance(field.default, (list, dict, set)):
+                mutable_defaults.append(name)
+            sub_model = field.type_
+            if not (
+                isinstance(sub_model, type)
+                and issubclass(sub_model, pydantic.BaseModel)
+            ):
+                sub_model = None
+            fields[field.alias] = (name, sub_model)
+        plan = _construction_plans[model] = _ConstructionPlan(
+            defaults, tuple(mutable_defaults), fields
+        )
+    return plan
+
 
 class BaseModel(pydantic.BaseModel, ContextInstanceMixin):
     class Config:
         allow_mutation = False
         use_enum_values = True
 
+    def __init__(__pydantic_self__, **data: typing.Any):
+        if not is_trusted_construction():
+            super().__init__(**data)
+            return
+
+        plan = _get_construction_plan(type(__pydantic_self__))
+        values = plan.defaults.copy()
+        for name in plan.mutable_defaults:
+            values[name] = copy.copy(values[name])
+
+        fields_set = set()
+        for key, value in data.items():
+            field = plan.fields.get(key)
+            if field is None:
+                continue  # extra fields are ignored, like with validation
+            name, sub_model = field
+            if sub_model is not None:
+                if isinstance(value, dict):
+                    value = sub_model(**value)
+                elif isinstance(value, list):
+                    value = [
+                        sub_model(**v) if isinstance(v, dict) else v for v in value
+                    ]
+            values[name] = value
+            fields_set.add(name)
+        object.__setattr__(__pydantic_self__, "__dict__", values)
+        object.__setattr__(__pydantic_self__, "__fields_set__", fields_set)
+
     def __str__(self):
         return str(self.dict(skip_defaults=True))
 
@@ -1 +1,2 @@
 from . import community
+from . import user
@@ -20,6 +20,11 @@ class BaseEvent(BaseModel):
     type: Enum = None
 
 
+class UnknownEvent(BaseEvent):
+    type: str = None
+    object: dict = None
+
+
 class MessageNew(BaseEvent):
     type: str = None
     object: Message = None
@@ -29,6 +34,10 @@ class MessageReply(MessageNew):
     type: str = None
 
 
+class MessageEdit(MessageNew):
+    type: str = None
+
+
 class MessageAllow(BaseEvent):
     type: str = None
     object: EventsObjects.MessageAllow = None
@@ -222,6 +231,7 @@ PhotoCommentNew.update_forward_refs()
 PhotoCommentRestore.update_forward_refs()
 PhotoNew.update_forward_refs()
 PollVoteNew.update_forward_refs()
+UnknownEvent.update_forward_refs()
 UserBlock.update_forward_refs()
 UserUnblock.update_forward_refs()
 Video.update_forward_refs()
@@ -4,6 +4,7 @@ from enum import Enum
 class Event(str, Enum):
     MESSAGE_NEW = "message_new"
     MESSAGE_REPLY = "message_reply"
+    MESSAGE_EDIT = "message_edit"
     MESSAGE_ALLOW = "message_allow"
     MESSAGES_DENY = "messages_deny"
 
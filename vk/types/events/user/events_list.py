@@ -0,0 +1,42 @@
+from enum import Enum
+
+
+class UserEvent(str, Enum):
+    """
+    Types of events of user long poll (https://vk.com/dev/using_longpoll).
+    New, outgoing and edited messages have types of community events.
+    """
+
+    MESSAGE_NEW = "message_new"
+    MESSAGE_REPLY = "message_reply"  # outgoing message
+    MESSAGE_EDIT = "message_edit"
+
+    MESSAGE_FLAGS_REPLACE = "message_flags_replace"
+    MESSAGE_FLAGS_SET = "message_flags_set"
+    MESSAGE_FLAGS_RESET = "message_flags_reset"
+
+    MESSAGES_READ_IN = "messages_read_in"
+    MESSAGES_READ_OUT = "messages_read_out"
+    MESSAGES_DELETE = "messages_delete"
+    MESSAGES_RESTORE = "messages_restore"
+
+    FRIEND_ONLINE = "friend_online"
+    FRIEND_OFFLINE = "friend_offline"
+
+    PEER_FLAGS_RESET = "peer_flags_reset"
+    PEER_FLAGS_REPLACE = "peer_flags_replace"
+    PEER_FLAGS_SET = "peer_flags_set"
+
+    CHAT_EDIT = "chat_edit"
+    CHAT_INFO_EDIT = "chat_info_edit"
+
+    USER_TYPING = "user_typing"
+    USER_TYPING_IN_CHAT = "user_typing_in_chat"
+    USERS_TYPING = "users_typing"
+    USERS_RECORDING_AUDIO = "users_recording_audio"
+    USER_CALL = "user_call"
+
+    COUNTER_UPDATE = "counter_update"
+    NOTIFICATIONS_SETTINGS_UPDATE = "notifications_settings_update"
+
+    UNKNOWN = "unknown"
@@ -0,0 +1,191 @@
+"""
+Lazy construction of models.
+
+Lazy model is an instance of (subclass of) usual model. Scalar fields are taken from
+raw dict right away, nested models are validated only when they are accessed first time.
+Good for events, most of which are dropped by middlewares or cheap rules.
+
+>>> message = make_lazy(Message, raw_message)
+>>> message.peer_id  # no validation
+>>> message.reply_message  # validated now
+
+Pickled lazy instance is restored as usual instance of model class.
+"""
+import copy
+import typing
+
+import pydantic
+
+from .base import BaseModel
+
+T = typing.TypeVar("T", bound=BaseModel)
+
+_SCALARS = (int, str, float, bool)
+_lazy_classes: typing.Dict[typing.Type[BaseModel], typing.Type[BaseModel]] = {}
+
+
+def _is_list(field) -> bool:
+    return getattr(field.outer_type_, "__origin__", None) in (list, typing.List)
+
+
+def _is_model(field) -> bool:
+    return isinstance(field.type_, type) and issubclass(field.type_, pydantic.BaseModel)
+
+
+def _validate(model_cls: typing.Type[BaseModel], name: str, value: typing.Any):
+    """
+    Validate one field of model.
+    :param model_cls:
+    :param name: name of field
+    :param value: raw value
+    :return: validated value
+    """
+    field = model_cls.__fields__[name]
+    value, errors = field.validate(value, {}, loc=name, cls=model_cls)
+    if errors:
+        raise pydantic.ValidationError([errors], model_cls)
+    return value
+
+
+def _restore(model_cls: typing.Type[BaseModel], state: dict) -> BaseModel:
+    """
+    Restore pickled lazy instance as instance of model class.
+    :param model_cls:
+    :param state:
+    :return:
+    """
+    instance = model_cls.__new__(model_cls)
+    instance.__setstate__(state)
+    return instance
+
+
+class _LazyField:
+    """
+    Descriptor of nested field which builds it from raw value on first access.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__
+        if self.name not in values:
+            values[self.name] = instance._build_field(self.name)
+        return values[self.name]
+
+
+class LazyModelMixin:
+    __lazy_raw__: dict
+    __lazy_pending__: typing.Tuple[str, ...] = ()
+    __lazy_model__: typing.Type[BaseModel]
+
+    def _build_field(self, name: str) -> typing.Any:
+        field = self.__fields__[name]
+        raw = self.__lazy_raw__
+        if name not in raw:
+            return copy.deepcopy(field.default)
+
+        value = raw[name]
+        sub_model = field.type_
+        if _is_list(field):
+            if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+                return [make_lazy(sub_model, v) for v in value]
+        elif isinstance(value, dict):
+            return make_lazy(sub_model, value)
+        return _validate(type(self), name, value)
+
+    def materialize(self):
+        """
+        Build all nested fields which weren't accessed yet.
+        :return: self
+        """
+        for name in self.__lazy_pending__:
+            getattr(self, name)
+        return self
+
+    def dict(self, *args, **kwargs):
+        self.materialize()
+        return super().dict(*args, **kwargs)
+
+    def json(self, *args, **kwargs):
+        self.materialize()
+        return super().json(*args, **kwargs)
+
+    def copy(self, *args, **kwargs):
+        self.materialize()
+        return super().copy(*args, **kwargs)
+
+    def __iter__(self):
+        self.materialize()
+        return super().__iter__()
+
+    def __getstate__(self):
+        self.materialize()
+        return super().__getstate__()
+
+    def __reduce_ex__(self, protocol):
+        # lazy class can't be found by pickle (it has name of model class),
+        # so instance is pickled as instance of model class.
+        return _restore, (self.__lazy_model__, self.__getstate__())
+
+
+def _get_lazy_class(model_cls: typing.Type[T]) -> typing.Type[T]:
+    lazy_cls = _lazy_classes.get(model_cls)
+    if lazy_cls is None:
+        nested = tuple(
+            name for name, field in model_cls.__fields__.items() if _is_model(field)
+        )
+        lazy_cls = type(
+            model_cls.__name__,
+            (LazyModelMixin, model_cls),
+            {
+                "__module__": model_cls.__module__,
+                "__qualname__": model_cls.__qualname__,
+                "__slots__": ("__lazy_raw__",),
+            },
+        )
+        lazy_cls.__lazy_pending__ = nested
+        lazy_cls.__lazy_model__ = model_cls
+        # share context instance with model class: Message.get_current() must work
+        lazy_cls._ContextInstanceMixin__context_instance = (
+            model_cls._ContextInstanceMixin__context_instance
+        )
+        for name in nested:
+            setattr(lazy_cls, name, _LazyField(name))
+        _lazy_classes[model_cls] = lazy_cls
+    return lazy_cls
+
+
+def make_lazy(model_cls: typing.Type[T], raw: dict) -> T:
+    """
+    Create lazy instance of model from raw dict.
+    :param model_cls: model class
+    :param raw: raw dict (e.g. event from VK)
+    :return: instance of model class
+    """
+    lazy_cls = _get_lazy_class(model_cls)
+    fields = model_cls.__fields__
+    values = {}
+    for name, field in fields.items():
+        if name in lazy_cls.__lazy_pending__:
+            continue
+        if name not in raw:
+            if field.required:
+                return model_cls(**raw)  # raise usual validation error
+            values[name] = copy.deepcopy(field.default)
+            continue
+        value = raw[name]
+        if value is None or (
+            field.outer_type_ in _SCALARS and type(value) is field.outer_type_
+        ):
+            values[name] = value
+        else:
+            values[name] = _validate(model_cls, name, value)
+
+    instance = lazy_cls.__new__(lazy_cls)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", set(raw) & set(fields))
+    object.__setattr__(instance, "__lazy_raw__", raw)
+    return instance
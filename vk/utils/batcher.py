@@ -0,0 +1,197 @@
+"""
+Coalesce API calls made in a short window into one 'execute' request.
+
+https://vk.com/dev/execute
+"""
+import asyncio
+import logging
+import typing
+
+from vk.constants import JSON_LIBRARY
+
+if typing.TYPE_CHECKING:
+    from vk import VK
+
+logger = logging.getLogger(__name__)
+
+EXECUTE_MAX_CALLS: int = 25  # vk allows up to 25 API calls in one 'execute'
+# errors caused by the batch itself, calls of such batch are sent separately
+BATCH_ERRORS = (12, 13)  # 12: unable to compile code, 13: runtime error in code
+
+
+class _BatchedCall(typing.NamedTuple):
+    method_name: str
+    params: dict
+    future: asyncio.Future
+
+
+class RequestBatcher:
+    """
+    Collect API calls and send them as one 'execute' request.
+
+    Every caller receives a 'raw' json of own call ({"response": ...} or {"error": ...}),
+    so errors are still handled by APIErrorDispatcher of VK object.
+    """
+
+    def __init__(
+        self, vk: "VK", delay: float = 0.05, max_calls: int = EXECUTE_MAX_CALLS
+    ):
+        """
+
+        :param vk: VK object which send 'execute' requests
+        :param delay: time in seconds to wait other calls before send batch
+        :param max_calls: max count of calls in one batch (maximum 25)
+        """
+        if not 0 < max_calls <= EXECUTE_MAX_CALLS:
+            raise ValueError(
+                f"Count of calls in one batch must be from 1 to {EXECUTE_MAX_CALLS}"
+            )
+        self.vk: "VK" = vk
+        self.delay: float = delay
+        self.max_calls: int = max_calls
+
+        self._calls: typing.List[_BatchedCall] = []
+        self._flush_handle: typing.Optional[asyncio.TimerHandle] = None
+
+    async def add(self, method_name: str, params: dict) -> dict:
+        """
+        Add call to the current batch and wait for the result.
+        :param method_name: name of method
+        :param params: parameters of method (without 'v' and 'access_token')
+        :return: 'raw' json of call
+        """
+        future = self.vk.loop.create_future()
+        self._calls.append(_BatchedCall(method_name, params, future))
+
+        if len(self._calls) >= self.max_calls:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.vk.loop.call_later(self.delay, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """
+        Send collected calls in background.
+        :return:
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        calls, self._calls = self._calls, []
+        if calls:
+            self.vk.loop.create_task(self._send_batch(calls))
+
+    @staticmethod
+    def build_code(calls: typing.List[_BatchedCall]) -> str:
+        """
+        Build VKScript code which call all methods and return list of results.
+        :param calls:
+        :return:
+        """
+        api_calls = ",".join(
+            f"API.{call.method_name}({JSON_LIBRARY.dumps(call.params)})"
+            for call in calls
+        )
+        return f"return [{api_calls}];"
+
+    @staticmethod
+    def _make_error(call: _BatchedCall, error: dict) -> dict:
+        """
+        Build error in format of usual API response.
+        :param call:
+        :param error: error from 'execute_errors'
+        :return:
+        """
+        request_params = [{"key": "method", "value": call.method_name}]
+        request_params.extend(
+            {"key": key, "value": value} for key, value in call.params.items()
+        )
+        return {
+            "error": {
+                "error_code": error.get("error_code"),
+                "error_msg": error.get("error_msg"),
+                "request_params": request_params,
+            }
+        }
+
+    @staticmethod
+    def _pop_error(
+        errors: typing.List[dict], call: _BatchedCall
+    ) -> typing.Optional[dict]:
+        """
+        Take first error of method of call from 'execute_errors'.
+        :param errors: remaining errors from 'execute_errors'
+        :param call:
+        :return: error or None if the method has no errors
+        """
+        for i, error in enumerate(errors):
+            if error.get("method") == call.method_name:
+                return errors.pop(i)
+        return None
+
+    async def _send_batch(self, calls: typing.List[_BatchedCall]):
+        """
+        Send one 'execute' request and resolve futures of calls.
+        :param calls:
+        :return:
+        """
+        if len(calls) == 1:
+            await self._send_one_by_one(calls)
+            return
+
+        logger.debug(f"Send batch of {len(calls)} calls with 'execute'")
+        try:
+            json = await self.vk._send_request(
+                "execute", {"code": self.build_code(calls)}
+            )
+        except Exception as e:  # noqa
+            for call in calls:
+                if not call.future.done():
+                    call.future.set_exception(e)
+            return
+
+        if "error" in json:
+            logger.debug(f"Batch failed with error: {json['error']}")
+            if json["error"].get("error_code") in BATCH_ERRORS:
+                await self._send_one_by_one(calls)
+                return
+            # other errors (rate limits, bad token) would fail every call as well
+            for call in calls:
+                if not call.future.done():
+                    call.future.set_result(self._make_error(call, json["error"]))
+            return
+
+        responses: list = json["response"] or []
+        errors: typing.List[dict] = list(json.get("execute_errors", []))
+
+        for call, response in zip(calls, responses):
+            if call.future.done():
+                continue
+            error = self._pop_error(errors, call) if response is False else None
+            if error is not None:
+                call.future.set_result(self._make_error(call, error))
+            else:
+                call.future.set_result({"response": response})
+
+        if len(responses) < len(calls):
+            await self._send_one_by_one(calls[len(responses) :])
+
+    async def _send_one_by_one(self, calls: typing.List[_BatchedCall]):
+        """
+        Send every call with its own request.
+        :param calls:
+        :return:
+        """
+        await asyncio.gather(*(self._send_one(call) for call in calls))
+
+    async def _send_one(self, call: _BatchedCall):
+        try:
+            json = await self.vk._send_request(call.method_name, call.params)
+        except Exception as e:  # noqa
+            if not call.future.done():
+                call.future.set_exception(e)
+            return
+        if not call.future.done():
+            call.future.set_result(json)
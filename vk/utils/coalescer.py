@@ -0,0 +1,75 @@
+"""
+Share one in-flight request between concurrent identical calls of read-only methods.
+"""
+import asyncio
+import typing
+
+if typing.TYPE_CHECKING:
+    from vk import VK
+
+# read-only methods: identical calls return the same result
+IDEMPOTENT_METHODS: typing.FrozenSet[str] = frozenset(
+    {
+        "users.get",
+        "groups.getById",
+        "groups.getMembers",
+        "groups.isMember",
+        "messages.getById",
+        "messages.getByConversationMessageId",
+        "messages.getConversationsById",
+        "messages.getConversationMembers",
+        "photos.getById",
+        "wall.getById",
+        "utils.resolveScreenName",
+        "friends.get",
+    }
+)
+
+
+class RequestCoalescer:
+    """
+    Concurrent calls with the same method and parameters wait for one request
+    (single-flight). Result isn't kept after request is done, so it's never stale.
+
+    Callers receive the same 'raw' json object, it must not be changed.
+    """
+
+    def __init__(self, vk: "VK", methods: typing.Iterable[str] = IDEMPOTENT_METHODS):
+        """
+
+        :param vk: VK object
+        :param methods: names of methods which calls are coalesced (only read-only methods)
+        """
+        self.vk: "VK" = vk
+        self.methods: typing.FrozenSet[str] = frozenset(methods)
+        self._in_flight: typing.Dict[typing.Hashable, asyncio.Task] = {}
+
+    @staticmethod
+    def _get_key(method_name: str, params: dict) -> typing.Hashable:
+        # values may be lists or dicts, so they are compared by repr
+        return method_name, tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+    async def request(
+        self,
+        method_name: str,
+        params: dict,
+        send: typing.Callable[[str, dict], typing.Awaitable[dict]],
+    ) -> dict:
+        """
+        Send request or wait for the same request which is already sent.
+        :param method_name: name of method
+        :param params: parameters of method
+        :param send: coroutine function which sends request and returns 'raw' json
+        :return: 'raw' json
+        """
+        if method_name not in self.methods:
+            return await send(method_name, params)
+
+        key = self._get_key(method_name, params)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self.vk.loop.create_task(send(method_name, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # cancellation of one caller doesn't cancel request of others
+        return await asyncio.shield(task)
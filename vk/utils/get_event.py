@@ -1,124 +1,105 @@
-from vk.types.events.community import event as eventobj
-from vk.types.events.community.events_list import Event
-
-
-def get_event_object(event) -> eventobj:
-    _event_type = Event(event["type"])
-
-    if _event_type is Event.MESSAGE_NEW:
-        ev = eventobj.MessageNew(**event)
-
-    elif _event_type is Event.MESSAGE_REPLY:
-        ev = eventobj.MessageReply(**event)
-
-    elif _event_type is Event.MESSAGE_ALLOW:
-        ev = eventobj.MessageAllow(**event)
-
-    elif _event_type is Event.MESSAGES_DENY:
-        ev = eventobj.MessageDeny(**event)
-
-    elif _event_type is Event.PHOTO_NEW:
-        ev = eventobj.PhotoNew(**event)
-
-    elif _event_type is Event.PHOTO_COMMENT_NEW:
-        ev = eventobj.PhotoCommentNew(**event)
-
-    elif _event_type is Event.PHOTO_COMMENT_EDIT:
-        ev = eventobj.PhotoCommentEdit(**event)
-
-    elif _event_type is Event.PHOTO_COMMENT_RESTORE:
-        ev = eventobj.PhotoCommentRestore(**event)
-
-    elif _event_type is Event.PHOTO_COMMENT_DELETE:
-        ev = eventobj.PhotoCommentDelete(**event)
-
-    elif _event_type is Event.AUDIO_NEW:
-        ev = eventobj.AudioNew(**event)
-
-    elif _event_type is Event.VIDEO_NEW:
-        ev = eventobj.VideoNew(**event)
-
-    elif _event_type is Event.VIDEO_COMMENT_NEW:
-        ev = eventobj.VideoCommentNew(**event)
-
-    elif _event_type is Event.VIDEO_COMMENT_EDIT:
-        ev = eventobj.VideoCommentEdit(**event)
-
-    elif _event_type is Event.VIDEO_COMMENT_RESTORE:
-        ev = eventobj.VideoCommentRestore(**event)
-
-    elif _event_type is Event.VIDEO_COMMENT_DELETE:
-        ev = eventobj.VideoCommentDelete(**event)
-
-    elif _event_type is Event.WALL_POST_NEW:
-        ev = eventobj.WallPostNew(**event)
-
-    elif _event_type is Event.WALL_REPOST:
-        ev = eventobj.WallRepost(**event)
+"""
+Building of event models from raw events.
 
-    elif _event_type is Event.WALL_REPLY_NEW:
-        ev = eventobj.WallReplyNew(**event)
+Models are found in registry by event type. Models for new or custom event types
+may be registered by user:
 
-    elif _event_type is Event.WALL_REPLY_EDIT:
-        ev = eventobj.WallReplyEdit(**event)
-
-    elif _event_type is Event.WALL_REPLY_RESTORE:
-        ev = eventobj.WallReplyRestore(**event)
-
-    elif _event_type is Event.WALL_REPLY_DELETE:
-        ev = eventobj.WallReplyDelete(**event)
-
-    elif _event_type is Event.BOARD_POST_NEW:
-        ev = eventobj.BoardPostNew(**event)
-
-    elif _event_type is Event.BOARD_POST_EDIT:
-        ev = eventobj.BoardPostEdit(**event)
-
-    elif _event_type is Event.BOARD_POST_RESTORE:
-        ev = eventobj.BoardPostRestore(**event)
-
-    elif _event_type is Event.BOARD_POST_DELETE:
-        ev = eventobj.BoardPostDelete(**event)
-
-    elif _event_type is Event.MARKET_COMMENT_NEW:
-        ev = eventobj.MarketCommentNew(**event)
-
-    elif _event_type is Event.MARKET_COMMENT_EDIT:
-        ev = eventobj.MarketCommentEdit(**event)
-
-    elif _event_type is Event.MARKET_COMMENT_RESTORE:
-        ev = eventobj.MarketCommentRestore(**event)
-
-    elif _event_type is Event.MARKET_COMMENT_DELETE:
-        ev = eventobj.MarketCommentDelete(**event)
-
-    elif _event_type is Event.GROUP_LEAVE:
-        ev = eventobj.GroupLeave(**event)
-
-    elif _event_type is Event.GROUP_JOIN:
-        ev = eventobj.GroupJoin(**event)
-
-    elif _event_type is Event.USER_BLOCK:
-        ev = eventobj.UserBlock(**event)
-
-    elif _event_type is Event.USER_UNBLOCK:
-        ev = eventobj.UserUnblock(**event)
-
-    elif _event_type is Event.POLL_VOTE_NEW:
-        ev = eventobj.PollVoteNew(**event)
-
-    elif _event_type is Event.GROUP_OFFICERS_EDIT:
-        ev = eventobj.GroupOfficersEdit(**event)
-
-    elif _event_type is Event.GROUP_CHANGE_SETTINGS:
-        ev = eventobj.GroupChangeSettings(**event)
-
-    elif _event_type is Event.GROUP_CHANGE_PHOTO:
-        ev = eventobj.GroupChangePhoto(**event)
-
-    else:
-        raise RuntimeError("Unexpected behavior. May be you handle NOT vk event.")
+>>> register_event_model("message_edit", MessageEdit)
+"""
+import typing
 
+from vk.types.base import BaseModel
+from vk.types.events.community import event as eventobj
+from vk.types.events.community.events_list import Event
+from vk.types.lazy import make_lazy
+
+_event_models: typing.Dict[str, typing.Type[eventobj.BaseEvent]] = {
+    Event.MESSAGE_NEW.value: eventobj.MessageNew,
+    Event.MESSAGE_REPLY.value: eventobj.MessageReply,
+    Event.MESSAGE_EDIT.value: eventobj.MessageEdit,
+    Event.MESSAGE_ALLOW.value: eventobj.MessageAllow,
+    Event.MESSAGES_DENY.value: eventobj.MessageDeny,
+    Event.PHOTO_NEW.value: eventobj.PhotoNew,
+    Event.PHOTO_COMMENT_NEW.value: eventobj.PhotoCommentNew,
+    Event.PHOTO_COMMENT_EDIT.value: eventobj.PhotoCommentEdit,
+    Event.PHOTO_COMMENT_RESTORE.value: eventobj.PhotoCommentRestore,
+    Event.PHOTO_COMMENT_DELETE.value: eventobj.PhotoCommentDelete,
+    Event.AUDIO_NEW.value: eventobj.AudioNew,
+    Event.VIDEO_NEW.value: eventobj.VideoNew,
+    Event.VIDEO_COMMENT_NEW.value: eventobj.VideoCommentNew,
+    Event.VIDEO_COMMENT_EDIT.value: eventobj.VideoCommentEdit,
+    Event.VIDEO_COMMENT_RESTORE.value: eventobj.VideoCommentRestore,
+    Event.VIDEO_COMMENT_DELETE.value: eventobj.VideoCommentDelete,
+    Event.WALL_POST_NEW.value: eventobj.WallPostNew,
+    Event.WALL_REPOST.value: eventobj.WallRepost,
+    Event.WALL_REPLY_NEW.value: eventobj.WallReplyNew,
+    Event.WALL_REPLY_EDIT.value: eventobj.WallReplyEdit,
+    Event.WALL_REPLY_RESTORE.value: eventobj.WallReplyRestore,
+    Event.WALL_REPLY_DELETE.value: eventobj.WallReplyDelete,
+    Event.BOARD_POST_NEW.value: eventobj.BoardPostNew,
+    Event.BOARD_POST_EDIT.value: eventobj.BoardPostEdit,
+    Event.BOARD_POST_RESTORE.value: eventobj.BoardPostRestore,
+    Event.BOARD_POST_DELETE.value: eventobj.BoardPostDelete,
+    Event.MARKET_COMMENT_NEW.value: eventobj.MarketCommentNew,
+    Event.MARKET_COMMENT_EDIT.value: eventobj.MarketCommentEdit,
+    Event.MARKET_COMMENT_RESTORE.value: eventobj.MarketCommentRestore,
+    Event.MARKET_COMMENT_DELETE.value: eventobj.MarketCommentDelete,
+    Event.GROUP_LEAVE.value: eventobj.GroupLeave,
+    Event.GROUP_JOIN.value: eventobj.GroupJoin,
+    Event.USER_BLOCK.value: eventobj.UserBlock,
+    Event.USER_UNBLOCK.value: eventobj.UserUnblock,
+    Event.POLL_VOTE_NEW.value: eventobj.PollVoteNew,
+    Event.GROUP_OFFICERS_EDIT.value: eventobj.GroupOfficersEdit,
+    Event.GROUP_CHANGE_SETTINGS.value: eventobj.GroupChangeSettings,
+    Event.GROUP_CHANGE_PHOTO.value: eventobj.GroupChangePhoto,
+}
+
+
+def get_event_type_value(event_type: typing.Union[Event, str]) -> str:
+    """
+    Get string value of event type.
+    :param event_type: member of Event or string
+    :return:
+    """
+    if isinstance(event_type, Event):
+        return event_type.value
+    return event_type
+
+
+def register_event_model(
+    event_type: typing.Union[Event, str], model: typing.Type[eventobj.BaseEvent]
+):
+    """
+    Register (or replace) model of event type.
+    :param event_type: member of Event or string type of event
+    :param model: event model which have fields 'type' and 'object'
+    :return:
+    """
+    _event_models[get_event_type_value(event_type)] = model
+
+
+def get_event_model(
+    event_type: typing.Union[Event, str]
+) -> typing.Type[eventobj.BaseEvent]:
+    """
+    Get model of event type. For unknown types returns UnknownEvent (with raw object).
+    :param event_type:
+    :return:
+    """
+    return _event_models.get(get_event_type_value(event_type), eventobj.UnknownEvent)
+
+
+def get_event_object(event: dict, lazy: bool = False) -> eventobj.BaseEvent:
+    """
+    Build event model from raw event.
+    :param event: raw event
+    :param lazy: build lazy model (nested models are validated on first access)
+    :return:
+    """
+    model = get_event_model(event["type"])
+
+    ev = make_lazy(model, event) if lazy else model(**event)
     ev.set_current(ev)
-    ev.object.set_current(ev.object)
+    if isinstance(ev.object, BaseModel):
+        ev.object.set_current(ev.object)
     return ev
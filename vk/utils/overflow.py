@@ -0,0 +1,10 @@
+"""
+Policies of bounded queues of events (worker pool of dispatcher, Streaming API buffer).
+"""
+from enum import Enum
+
+
+class OverflowPolicy(str, Enum):
+    WAIT = "wait"  # wait for free place in queue (pause extension)
+    DROP_NEW = "drop_new"  # drop coming event
+    DROP_OLD = "drop_old"  # drop the oldest event in queue
@@ -0,0 +1,180 @@
+"""
+Proactive limiting of API requests rate.
+
+https://vk.com/dev/api_requests (limits: 3 requests per second for users, 20 for communities)
+"""
+import asyncio
+import logging
+import time
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiterStats(typing.NamedTuple):
+    acquired: int = 0  # count of passed requests
+    waiting: int = 0  # count of requests which wait now
+    total_wait_time: float = 0.0  # seconds
+    max_wait_time: float = 0.0  # seconds
+
+    @property
+    def average_wait_time(self) -> float:
+        if not self.acquired:
+            return 0.0
+        return self.total_wait_time / self.acquired
+
+
+class TokenBucket:
+    """
+    Classic token bucket. Every request takes one token,
+    tokens are refilled with 'rate' tokens per second up to 'capacity'.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        """
+
+        :param rate: tokens per second
+        :param capacity: max count of tokens (burst size). By default equal to rate.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate: float = rate
+        self.capacity: int = capacity if capacity else max(1, int(rate))
+
+        self._tokens: float = float(self.capacity)
+        self._updated_at: float = time.monotonic()
+        self._lock: typing.Optional[asyncio.Lock] = None
+
+        self._acquired = 0
+        self._waiting = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    @property
+    def available(self) -> float:
+        """
+        Count of tokens available right now.
+        :return:
+        """
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        """
+        Count of requests which wait for a token right now.
+        :return:
+        """
+        return self._waiting
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(
+            self._acquired, self._waiting, self._total_wait_time, self._max_wait_time
+        )
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token and take it.
+        :return: time in seconds which request waited in queue
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        started_at = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._lock:  # waiters are served in FIFO order
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started_at
+        self._acquired += 1
+        self._total_wait_time += waited
+        self._max_wait_time = max(self._max_wait_time, waited)
+        return waited
+
+
+class RateLimiter:
+    """
+    Set of token buckets, one per access token.
+
+    >>> limiter = RateLimiter(rate=20)
+    >>> limiter.set_limit(user_token, 3)
+    >>> vk = VK(token, rate_limiter=limiter)
+    """
+
+    def __init__(self, rate: float = 20, burst: int = None):
+        """
+
+        :param rate: standart count of requests per second for one access token
+        :param burst: standart max count of requests sent at once. By default equal to rate.
+        """
+        self.rate: float = rate
+        self.burst: typing.Optional[int] = burst
+        self._buckets: typing.Dict[str, TokenBucket] = {}
+
+    def set_limit(self, key: str, rate: float, burst: int = None):
+        """
+        Set specify limit for access token.
+        :param key: access token
+        :param rate: count of requests per second
+        :param burst: max count of requests sent at once
+        :return:
+        """
+        self._buckets[key] = TokenBucket(rate, burst)
+
+    def get_bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def available(self, key: str) -> float:
+        """
+        Remaining rate budget of access token (available tokens minus waiting requests).
+        :param key: access token
+        :return:
+        """
+        bucket = self.get_bucket(key)
+        return bucket.available - bucket.waiting
+
+    async def acquire(self, key: str) -> float:
+        """
+        Wait until request with this access token may be sent.
+        :param key: access token
+        :return: time in seconds which request waited in queue
+        """
+        waited = await self.get_bucket(key).acquire()
+        if waited > 0.001:
+            logger.debug(f"Request waited {waited:.3f} seconds in rate limiter queue")
+        return waited
+
+    def stats_for(self, key: str) -> RateLimiterStats:
+        return self.get_bucket(key).stats
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """
+        Summary statistics of all access tokens.
+        :return:
+        """
+        stats = [bucket.stats for bucket in self._buckets.values()]
+        return RateLimiterStats(
+            acquired=sum(s.acquired for s in stats),
+            waiting=sum(s.waiting for s in stats),
+            total_wait_time=sum(s.total_wait_time for s in stats),
+            max_wait_time=max((s.max_wait_time for s in stats), default=0.0),
+        )
@@ -0,0 +1,128 @@
+"""
+Pool of access tokens for spreading API requests.
+"""
+import itertools
+import logging
+import time
+import typing
+
+from vk.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+AUTH_ERRORS: typing.Tuple[int, ...] = (5,)  # token is invalid, remove it from pool
+# token is disabled for a short time, next second it may be used again
+PER_SECOND_ERRORS: typing.Tuple[int, ...] = (6,)  # too many requests per second
+# 9: flood control, 29: rate limit reached
+RATE_ERRORS: typing.Tuple[int, ...] = (9, 29)
+
+
+class TokenPool:
+    """
+    Spread API requests across several interchangeable access tokens.
+
+    Tokens with invalid authorization are removed from rotation, tokens which
+    reached rate limits are disabled for 'disable_time' seconds (for
+    'per_second_disable_time' seconds after 'too many requests per second' error).
+
+    >>> vk = VK(TokenPool([token1, token2, token3]), rate_limiter=RateLimiter(rate=20))
+    """
+
+    def __init__(
+        self,
+        tokens: typing.Iterable[str],
+        disable_time: float = 60,
+        per_second_disable_time: float = 1,
+    ):
+        """
+
+        :param tokens: access tokens with the same rights
+        :param disable_time: seconds for which token is out of rotation after rate error
+            (flood control or daily limit)
+        :param per_second_disable_time: seconds for which token is out of rotation
+            after 'too many requests per second' error
+        """
+        self._tokens: typing.List[str] = list(tokens)
+        if not self._tokens:
+            raise ValueError("Token pool must have at least one token")
+        self.disable_time: float = disable_time
+        self.per_second_disable_time: float = per_second_disable_time
+
+        self._disabled_until: typing.Dict[str, float] = {}
+        self._removed: typing.Set[str] = set()
+        self._cycle = itertools.cycle(self._tokens)
+
+    @property
+    def tokens(self) -> typing.List[str]:
+        """
+        Returns a list of all tokens in pool.
+        :return:
+        """
+        return self._tokens
+
+    @property
+    def active_tokens(self) -> typing.List[str]:
+        """
+        Returns a list of tokens which are in rotation now.
+        :return:
+        """
+        now = time.monotonic()
+        return [
+            token
+            for token in self._tokens
+            if token not in self._removed and self._disabled_until.get(token, 0) <= now
+        ]
+
+    def get_token(self, rate_limiter: RateLimiter = None) -> str:
+        """
+        Get token for next request.
+        With rate limiter chooses token which has the biggest remaining rate budget,
+        without it uses round-robin.
+        :param rate_limiter:
+        :return:
+        """
+        active = self.active_tokens
+        if not active:
+            alive = [token for token in self._tokens if token not in self._removed]
+            if not alive:
+                raise RuntimeError("All tokens in pool have invalid authorization.")
+            # all tokens are disabled, use token which will be enabled first.
+            return min(alive, key=lambda token: self._disabled_until.get(token, 0))
+
+        if rate_limiter is not None:
+            return max(active, key=rate_limiter.available)
+
+        for token in self._cycle:
+            if token in active:
+                return token
+
+    def report_error(self, token: str, error_code: int) -> bool:
+        """
+        Take token out of rotation if error is related to token.
+        :param token:
+        :param error_code: code of API error
+        :return: True if token was taken out of rotation
+        """
+        if error_code in AUTH_ERRORS:
+            logger.warning("Token removed from pool: invalid authorization.")
+            self._removed.add(token)
+            return True
+        if error_code in PER_SECOND_ERRORS or error_code in RATE_ERRORS:
+            disable_time = (
+                self.per_second_disable_time
+                if error_code in PER_SECOND_ERRORS
+                else self.disable_time
+            )
+            logger.debug(f"Token disabled for {disable_time} seconds: [{error_code}]")
+            self._disabled_until[token] = time.monotonic() + disable_time
+            return True
+        return False
+
+    def enable(self, token: str):
+        """
+        Return token to rotation.
+        :param token:
+        :return:
+        """
+        self._removed.discard(token)
+        self._disabled_until.pop(token, None)
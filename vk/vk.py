@@ -19,6 +19,11 @@ from vk.constants import JSON_LIBRARY
 from vk.exceptions import APIErrorDispatcher
 from vk.methods import API
 from vk.utils import ContextInstanceMixin
+from vk.utils.batcher import RequestBatcher
+from vk.utils.coalescer import IDEMPOTENT_METHODS
+from vk.utils.coalescer import RequestCoalescer
+from vk.utils.rate_limiter import RateLimiter
+from vk.utils.token_pool import TokenPool
 
 logger = logging.getLogger(__name__)
 
@@ -37,19 +42,38 @@ class VK(ContextInstanceMixin):
 
     def __init__(
         self,
-        access_token: str,
+        access_token: typing.Union[str, TokenPool],
         *,
         loop: AbstractEventLoop = None,
         client: ClientSession = None,
+        batch_requests: bool = False,
+        batch_delay: float = 0.05,
+        rate_limiter: RateLimiter = None,
+        trusted_models: bool = False,
+        coalesce_requests: bool = False,
+        coalesce_methods: typing.Iterable[str] = IDEMPOTENT_METHODS,
     ):
 
         """
 
         :param str access_token: access token of VK user/community for access to VK methods.
+            Or TokenPool for spread requests across several tokens.
         :param AbstractEventLoop loop: asyncio event loop, uses in Task manager/dispatcher extensions/etc.
         :param ClientSession client: aiohttp client session
+        :param bool batch_requests: coalesce API calls into 'execute' requests (up to 25 calls)
+        :param float batch_delay: time in seconds to collect calls in one batch
+        :param RateLimiter rate_limiter: limiter which keeps requests rate under API limits
+        :param bool trusted_models: build models from VK responses and events without validation
+        :param bool coalesce_requests: concurrent identical calls of read-only methods
+            wait for one request
+        :param coalesce_methods: names of read-only methods which calls are coalesced
         """
-        self.access_token = access_token
+        if isinstance(access_token, TokenPool):
+            self.token_pool: typing.Optional[TokenPool] = access_token
+            self.access_token = None
+        else:
+            self.token_pool = None
+            self.access_token = access_token
         self.loop = loop if loop is not None else asyncio.get_event_loop()
         self.client = (
             client
@@ -58,6 +82,14 @@ class VK(ContextInstanceMixin):
         )
 
         self.error_dispatcher = APIErrorDispatcher(self)
+        self.rate_limiter: typing.Optional[RateLimiter] = rate_limiter
+        self.trusted_models: bool = trusted_models
+        self.batcher: typing.Optional[RequestBatcher] = (
+            RequestBatcher(self, delay=batch_delay) if batch_requests else None
+        )
+        self.coalescer: typing.Optional[RequestCoalescer] = (
+            RequestCoalescer(self, coalesce_methods) if coalesce_requests else None
+        )
 
         self.__api_object = self.__get_api()
         VK.set_current(self)
@@ -83,20 +115,72 @@ class VK(ContextInstanceMixin):
         elif params is None or not isinstance(params, dict):
             params = {}
 
-        params.update({"v": API_VERSION, "access_token": self.access_token})
         logger.debug(f"Params to send: {params}")
-        async with self.client.post(API_LINK + method_name, data=params) as response:
-            json: typing.Dict[str, typing.Any] = await response.json(
-                loads=JSON_LIBRARY.loads
-            )
-            logger.debug(f"Method {method_name} called. Response from API: {json}")
-            if "error" in json:
-                return await self.error_dispatcher.error_handle(json, ignore_errors)
-
-            if _raw_mode:
-                return json
-
-            return json["response"]
+        if self.coalescer is not None:
+            json = await self.coalescer.request(method_name, params, self._send)
+        else:
+            json = await self._send(method_name, params)
+
+        logger.debug(f"Method {method_name} called. Response from API: {json}")
+        if "error" in json:
+            return await self.error_dispatcher.error_handle(json, ignore_errors)
+
+        if _raw_mode:
+            return json
+
+        return json["response"]
+
+    async def _send(self, method_name: typing.AnyStr, params: dict) -> dict:
+        """
+        Send request (in batch, if batching is enabled) and return 'raw' response.
+        :param method_name: method of name when need to call
+        :param params: parameters with method
+        :return:
+        """
+        if self.batcher is not None and method_name != "execute":
+            return await self.batcher.add(method_name, params)
+        return await self._send_request(method_name, params)
+
+    async def _send_request(
+        self, method_name: typing.AnyStr, params: dict
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Send one HTTP request to API and return 'raw' response.
+        :param method_name: method of name when need to call
+        :param params: parameters with method
+        :return:
+        """
+        while True:
+            access_token = self._get_access_token()
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(access_token)
+
+            data = {**params, "v": API_VERSION, "access_token": access_token}
+            async with self.client.post(API_LINK + method_name, data=data) as response:
+                json: typing.Dict[str, typing.Any] = await response.json(
+                    loads=JSON_LIBRARY.loads
+                )
+
+            if (
+                self.token_pool is not None
+                and "error" in json
+                and self.token_pool.report_error(
+                    access_token, json["error"]["error_code"]
+                )
+                and self.token_pool.active_tokens
+            ):
+                # token taken out of rotation, repeat request with another token.
+                continue
+            return json
+
+    def _get_access_token(self) -> str:
+        """
+        Get access token for next request.
+        :return:
+        """
+        if self.token_pool is not None:
+            return self.token_pool.get_token(self.rate_limiter)
+        return self.access_token
 
     async def api_request(
         self, method_name: str, params: dict = None, ignore_errors: bool = False